@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Benchmark suite for stjlib and the Python conversion tools.
+
+Synthetic transcripts from one minute to 24 hours are generated with
+``tools/python/stj_generate.py`` into a temporary directory, and every case
+is put through loading, validation (per rule group), serialization and each
+subtitle converter.  Each benchmark reports
+its best and mean wall time over ``--repeat`` runs and its peak traced
+memory from one extra run under ``tracemalloc``.  The import time of
+``stjlib`` and the converter scripts is measured in fresh interpreters.
+
+Results can be written as JSON and compared against a stored baseline::
+
+    python benchmarks/benchmark_stjlib.py --sizes 1m,10m -o baseline.json
+    python benchmarks/benchmark_stjlib.py --sizes 1m,10m --compare baseline.json
+
+The compare run exits with status 1 when a benchmark got slower or used
+more memory than the baseline by more than ``--threshold``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+TOOLS_DIR = PROJECT_ROOT / 'tools' / 'python'
+
+for path in (VENDOR_DIR, TOOLS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import stjlib  # noqa: E402
+from stjlib import StandardTranscriptionJSON  # noqa: E402
+from stjlib.validation import validators  # noqa: E402
+
+from stj_generate import CorpusSpec, write_corpus  # noqa: E402
+from stj_to_ass import write_ass  # noqa: E402
+from stj_to_srt import write_srt  # noqa: E402
+from stj_to_ttml import write_ttml  # noqa: E402
+from stj_to_vtt import write_vtt  # noqa: E402
+
+SIZES = {
+    '1m': 60,
+    '10m': 10 * 60,
+    '1h': 60 * 60,
+    '6h': 6 * 60 * 60,
+    '24h': 24 * 60 * 60,
+}
+DEFAULT_SIZES = ['1m', '10m', '1h']
+
+# name: CorpusSpec keywords
+VARIANTS = {
+    'plain': {'word_timing': False},
+    'words': {},
+    'multilingual': {'languages': 4, 'speakers': 4},
+    'speakers': {'speakers': 1000},
+}
+DEFAULT_VARIANTS = list(VARIANTS)
+
+CONVERTERS = {
+    'srt': write_srt,
+    'vtt': write_vtt,
+    'ass': write_ass,
+    'ttml': write_ttml,
+}
+
+DEFAULT_THRESHOLD = 0.10
+# Timings below this many seconds are too noisy to flag as regressions
+NOISE_FLOOR = 0.005
+
+# Modules whose import time is measured in a fresh interpreter
+IMPORT_MODULES = ['stjlib', 'stj_to_srt', 'stj_convert']
+
+# Words spoken per second of transcript duration
+WORDS_PER_SECOND = 2.5
+
+
+def _rule_groups():
+    """Return the validator rule groups in the order ``validate_stj`` runs them."""
+    return {
+        'root_structure': lambda stj: validators.validate_root_structure(stj),
+        'types': lambda stj: validators.validate_types(stj),
+        'references': lambda stj: validators.validate_references(stj.transcript),
+        'version': lambda stj: validators.validate_version(stj.version),
+        'metadata': lambda stj: validators.validate_metadata(stj.metadata) if stj.metadata else [],
+        'transcript': lambda stj: validators.validate_transcript(stj.transcript),
+        'language_codes': lambda stj: validators.validate_language_codes(
+            stj.metadata, stj.transcript),
+        'language_consistency': lambda stj: validators.validate_language_consistency(
+            stj.metadata, stj.transcript),
+        'confidence_scores': lambda stj: validators.validate_confidence_scores(stj.transcript),
+        'extensions': lambda stj: validators.validate_all_extensions(stj),
+    }
+
+
+def benchmarks_for(path, workdir):
+    """Return ``(name, callable)`` pairs for one case file."""
+    stj = StandardTranscriptionJSON.from_file(path)
+    out = os.path.join(workdir, 'out')
+
+    cases = [
+        ('from_file', lambda: StandardTranscriptionJSON.from_file(path)),
+        ('peek', lambda: StandardTranscriptionJSON.peek(path)),
+        ('validate', lambda: validators.validate_stj(stj.stj)),
+    ]
+    for group, check in _rule_groups().items():
+        cases.append(('validate.' + group, lambda check=check: check(stj.stj)))
+    cases.append(('to_dict', stj.to_dict))
+    cases.append(('to_file', lambda: stj.to_file(out + '.stj.json')))
+    for fmt, write in CONVERTERS.items():
+        cases.append(('convert.' + fmt, lambda fmt=fmt, write=write: write(stj, out + '.' + fmt)))
+    return cases
+
+
+def measure(func, repeat):
+    """Return best and mean wall time over ``repeat`` runs and the traced peak."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'seconds': min(times),
+        'mean_seconds': sum(times) / len(times),
+        'peak_bytes': peak,
+    }
+
+
+def import_seconds(module):
+    """Return the cumulative import time of ``module`` in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join((str(VENDOR_DIR), str(TOOLS_DIR))))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    # Lines read "import time: <self us> | <cumulative us> | <indented name>"
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2].startswith('  '):
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def run_imports(repeat, only=None, log=print):
+    """Measure the import time of ``IMPORT_MODULES`` and return the result records."""
+    results = []
+    for module in IMPORT_MODULES:
+        name = 'import.' + module
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        times = [import_seconds(module) for _ in range(repeat)]
+        record = {'case': 'startup', 'benchmark': name, 'seconds': min(times),
+                  'mean_seconds': sum(times) / len(times), 'peak_bytes': 0}
+        results.append(record)
+        log("%-22s %-30s %10.4fs" % ('startup', name, record['seconds']))
+    return results
+
+
+def run(sizes, variants, repeat, only=None, log=print):
+    """Run every benchmark for every case and return the result records."""
+    results = run_imports(repeat, only, log)
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for variant in variants:
+                case = '%s-%s' % (size, variant)
+                path = os.path.join(workdir, case + '.stj.json')
+                words = int(SIZES[size] * WORDS_PER_SECOND)
+                write_corpus(CorpusSpec(words=words, **VARIANTS[variant]), path)
+                for name, func in benchmarks_for(path, workdir):
+                    if only and not any(name.startswith(prefix) for prefix in only):
+                        continue
+                    record = {'case': case, 'benchmark': name, **measure(func, repeat)}
+                    results.append(record)
+                    log("%-22s %-30s %10.4fs %10.1f MiB" % (
+                        case, name, record['seconds'], record['peak_bytes'] / 2 ** 20))
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'stjlib': stjlib.__version__,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return regressions of ``results`` against ``baseline`` result records.
+
+    A benchmark regresses when its best time or its peak memory exceeds the
+    baseline by more than ``threshold`` (a fraction).  Timings under
+    ``NOISE_FLOOR`` seconds in both runs are not compared.
+    """
+    base = {(r['case'], r['benchmark']): r for r in baseline}
+    regressions = []
+    for record in results:
+        old = base.get((record['case'], record['benchmark']))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            before, after = old[metric], record[metric]
+            if metric == 'seconds' and max(before, after) < NOISE_FLOOR:
+                continue
+            if before and after > before * (1 + threshold):
+                regressions.append({
+                    'case': record['case'],
+                    'benchmark': record['benchmark'],
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'change': after / before - 1,
+                })
+    return regressions
+
+
+def _parse_list(value, choices):
+    items = [item.strip() for item in value.split(',') if item.strip()]
+    unknown = [item for item in items if item not in choices]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            "unknown value(s) %s (choose from %s)" % (', '.join(unknown), ', '.join(choices)))
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stjlib and the STJ converters.")
+    parser.add_argument('--sizes', type=lambda v: _parse_list(v, SIZES), default=DEFAULT_SIZES,
+                        help="Comma-separated transcript durations: %s (default: %s)"
+                        % (', '.join(SIZES), ','.join(DEFAULT_SIZES)))
+    parser.add_argument('--variants', type=lambda v: _parse_list(v, VARIANTS),
+                        default=DEFAULT_VARIANTS,
+                        help="Comma-separated transcript shapes: %s (default: all)"
+                        % ', '.join(VARIANTS))
+    parser.add_argument('--only', type=lambda v: v.split(','),
+                        help="Run only benchmarks whose name starts with one of these prefixes")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Timed runs per benchmark (default: 3)")
+    parser.add_argument('-o', '--output', help="Write the results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Compare against a results file and fail on regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown or memory growth as a fraction (default: 0.10)")
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    results = run(args.sizes, args.variants, args.repeat, args.only)
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold)
+        for r in regressions:
+            print("REGRESSION %-22s %-30s %-10s %+.1f%%" % (
+                r['case'], r['benchmark'], r['metric'], r['change'] * 100))
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}")
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
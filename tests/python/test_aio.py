@@ -0,0 +1,106 @@
+"""Tests for the asyncio interface in stjlib.aio."""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from stjlib import StandardTranscriptionJSON, ValidationError, aio
+from stjlib.aio import AsyncSTJ
+
+from stj_generate import CorpusSpec, write_corpus
+from stj_to_srt import write_srt
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+
+
+def _segments(stj):
+    return [s.to_dict() for s in stj.transcript.segments]
+
+
+def test_load_matches_from_file_in_chunks():
+    runner = AsyncSTJ(chunk_size=2)
+    stj = asyncio.run(runner.load(COMPLEX, validate=True))
+    expected = StandardTranscriptionJSON.from_file(COMPLEX)
+    assert stj.stj.to_dict() == expected.stj.to_dict()
+
+
+def test_save_round_trips_and_validate_reports_issues(tmp_path):
+    path = str(tmp_path / 'out.stj.json')
+
+    async def scenario():
+        stj = await aio.load(COMPLEX)
+        await aio.save(stj, path)
+        assert await aio.validate(stj) == []
+        stj.transcript.segments[0].speaker_id = 'missing'
+        with pytest.raises(ValidationError):
+            await aio.validate(stj)
+        return stj, await aio.validate(stj, raise_exception=False)
+
+    original, issues = asyncio.run(scenario())
+    assert issues
+    saved = StandardTranscriptionJSON.from_file(path, validate=True)
+    assert _segments(saved)[1:] == _segments(original)[1:]
+    assert os.listdir(tmp_path) == ['out.stj.json']
+
+
+def test_convert_runs_writer_with_bounded_concurrency(tmp_path):
+    stj = StandardTranscriptionJSON.from_file(COMPLEX)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def slow_writer(doc, path):
+        with lock:
+            active.append(path)
+            peak.append(len(active))
+        time.sleep(0.02)
+        write_srt(doc, path)
+        with lock:
+            active.remove(path)
+        return path
+
+    async def scenario():
+        runner = AsyncSTJ(max_concurrency=2)
+        paths = [str(tmp_path / f'{i}.srt') for i in range(6)]
+        return await asyncio.gather(*(runner.convert(stj, slow_writer, p) for p in paths))
+
+    paths = asyncio.run(scenario())
+    assert max(peak) <= 2
+    assert all(os.path.getsize(p) > 0 for p in paths)
+
+
+def test_cancelled_save_leaves_no_file(tmp_path):
+    source = str(tmp_path / 'big.stj.json')
+    write_corpus(CorpusSpec(words=30000), source)
+    target = str(tmp_path / 'copy.stj.json')
+
+    async def scenario():
+        runner = AsyncSTJ(chunk_size=1)
+        stj = await runner.load(source)
+        task = asyncio.ensure_future(runner.save(stj, target))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert sorted(os.listdir(tmp_path)) == ['big.stj.json']
+
+
+def test_process_executor(tmp_path):
+    async def scenario(executor):
+        runner = AsyncSTJ(executor=executor)
+        stj = await runner.load(COMPLEX, validate=True)
+        return stj, await runner.validate(stj)
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        stj, issues = asyncio.run(scenario(executor))
+    assert issues == []
+    assert json.dumps(stj.stj.to_dict()) == json.dumps(
+        StandardTranscriptionJSON.from_file(COMPLEX).stj.to_dict()
+    )
@@ -0,0 +1,68 @@
+"""Tests for stjlib.alignment word realignment."""
+
+from stjlib import Segment, StandardTranscriptionJSON, Word, realign_segment, realign_transcript
+from stjlib.alignment import align_tokens
+from stjlib.validation import validate_stj
+
+
+def _words(*spec):
+    return [Word(text=text, start=start, end=end) for text, start, end in spec]
+
+
+def test_align_tokens_ignores_case_and_punctuation():
+    assert align_tokens(["Hello,", "big", "world"], ["hello", "world"]) == [
+        (0, 0), (1, None), (2, 1),
+    ]
+    assert align_tokens([], ["a"]) == [(None, 0)]
+
+
+def test_align_tokens_is_banded_but_exact_for_local_edits():
+    tokens = [f"w{i}" for i in range(5000)]
+    words = [t for i, t in enumerate(tokens) if i % 10]
+    pairs = align_tokens(tokens, words)
+    matched = [(t, w) for t, w in pairs if t is not None and w is not None]
+    assert len(matched) == len(words)
+    assert all(tokens[t] == words[w] for t, w in matched)
+
+
+def test_realign_keeps_matches_and_interpolates_insertions():
+    segment = Segment(text="Ladies and gentlemen, welcome to the show", start=0.0, end=3.0,
+                      words=_words(("Ladies", 0.0, 0.5), ("and", 0.5, 0.7), ("gentle", 0.7, 1.3),
+                                   ("men", 1.3, 1.5), ("welcome", 2.0, 2.6)))
+    segment.words[1].confidence = 0.9
+
+    assert realign_segment(segment) is True
+    words = [(w.text, w.start, w.end) for w in segment.words]
+    assert words[:4] == [("Ladies", 0.0, 0.5), ("and", 0.5, 0.7),
+                         ("gentlemen,", 0.7, 1.5), ("welcome", 2.0, 2.6)]
+    assert [w[0] for w in words[4:]] == ["to", "the", "show"]
+    assert words[4][1] == 2.6 and words[-1][2] == 3.0
+    assert segment.words[1].confidence == 0.9
+    assert segment.words[2].confidence is None
+
+
+def test_realign_skips_matching_and_partially_timed_segments():
+    matching = Segment(text="a b", start=0.0, end=1.0, words=_words(("a", 0.0, 0.5), ("b", 0.5, 1.0)))
+    partial = Segment(text="a c", start=0.0, end=1.0,
+                      words=[Word(text="a", start=0.0, end=0.5), Word(text="b")])
+    assert realign_segment(matching) is False
+    assert realign_segment(partial) is False
+
+
+def test_realign_transcript_clears_text_mismatch_warnings():
+    data = {"stj": {"version": "0.6.0", "transcript": {"segments": [
+        {"text": "The quick brown fox", "start": 0.0, "end": 2.0, "words": [
+            {"text": "the", "start": 0.0, "end": 0.4},
+            {"text": "quack", "start": 0.4, "end": 0.9},
+            {"text": "fox", "start": 1.5, "end": 2.0},
+        ]},
+        {"text": "jumps", "start": 2.0, "end": 2.5, "words": [
+            {"text": "jumps", "start": 2.0, "end": 2.5},
+        ]},
+    ]}}}
+    stj = StandardTranscriptionJSON.from_dict(data)
+    assert any("does not match" in issue.message for issue in validate_stj(stj.stj))
+
+    assert realign_transcript(stj) == 1
+    assert " ".join(w.text for w in stj.transcript.segments[0].words) == "The quick brown fox"
+    assert validate_stj(stj.stj) == []
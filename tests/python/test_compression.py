@@ -0,0 +1,96 @@
+"""Tests for transparent compressed STJ I/O in stjlib.compression and the tools."""
+
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+from stjlib import StandardTranscriptionJSON, aio
+from stjlib.compression import detect_compression, open_binary, open_text
+from stjlib.streaming import STJWriter, iter_segments
+
+from stj_to_srt import write_srt
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+
+
+def _segments(stj):
+    return [s.to_dict() for s in stj.transcript.segments]
+
+
+@pytest.mark.parametrize('suffix, codec', [('.gz', 'gzip'), ('.xz', 'xz'), ('.bz2', 'bz2')])
+def test_round_trip_by_extension(tmp_path, suffix, codec):
+    stj = StandardTranscriptionJSON.from_file(COMPLEX)
+    path = str(tmp_path / ('out.stj.json' + suffix))
+    stj.to_file(path, compresslevel=1)
+
+    with open(path, 'rb') as f:
+        assert detect_compression(f.read(6)) == codec
+    loaded = StandardTranscriptionJSON.from_file(path, validate=True)
+    assert loaded.stj.to_dict() == stj.stj.to_dict()
+    assert StandardTranscriptionJSON.peek(path) == (stj.version, stj.metadata)
+
+
+def test_detects_codec_from_magic_bytes_and_streams(tmp_path):
+    stj = StandardTranscriptionJSON.from_file(COMPLEX)
+    # Compressed content under a plain name is still detected
+    misnamed = tmp_path / 'misnamed.stj.json'
+    with open(COMPLEX, 'rb') as src, gzip.open(misnamed, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    assert StandardTranscriptionJSON.from_file(str(misnamed)).stj.to_dict() == stj.stj.to_dict()
+
+    path = str(tmp_path / 'streamed.stj.json.xz')
+    with STJWriter(path, version=stj.version, speakers=stj.transcript.speakers,
+                   compresslevel=0) as writer:
+        writer.write_segments(stj.transcript.segments)
+    assert [s.to_dict() for s in iter_segments(path)] == _segments(stj)
+
+    # An explicit codec overrides the extension; None writes plain text
+    plain = str(tmp_path / 'plain.json.gz')
+    with open_text(plain, 'w', compression=None) as f:
+        f.write('{}')
+    with open_binary(plain) as f:
+        assert f.read() == b'{}'
+
+    with pytest.raises(ValueError):
+        open_text(str(tmp_path / 'bad.gz'), 'w', compresslevel=12)
+
+
+def test_async_save_and_load_compressed(tmp_path):
+    path = str(tmp_path / 'async.stj.json.bz2')
+
+    async def scenario():
+        stj = await aio.load(COMPLEX)
+        await aio.save(stj, path)
+        return stj, await aio.load(path, validate=True)
+
+    original, loaded = asyncio.run(scenario())
+    assert _segments(loaded) == _segments(original)
+    assert os.listdir(tmp_path) == ['async.stj.json.bz2']
+
+
+def test_tools_read_and_write_compressed_files(tmp_path):
+    source = tmp_path / 'talk.stj.json.gz'
+    with open(COMPLEX, 'rb') as src, gzip.open(source, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+
+    result = subprocess.run(['python', 'tools/python/stj_validator.py', str(source)],
+                            capture_output=True, text=True, cwd=PROJECT_ROOT)
+    assert result.returncode == 0, result.stdout
+
+    result = subprocess.run(
+        ['python', 'tools/python/stj_convert.py', str(tmp_path), '-f', 'srt,vtt',
+         '--compress', 'gzip', '-j', '1'],
+        capture_output=True, text=True, cwd=PROJECT_ROOT,
+    )
+    assert result.returncode == 0, result.stdout
+    assert sorted(os.listdir(tmp_path)) == ['talk.srt.gz', 'talk.stj.json.gz', 'talk.vtt.gz']
+
+    expected = tmp_path / 'expected.srt'
+    write_srt(StandardTranscriptionJSON.from_file(COMPLEX), str(expected))
+    with gzip.open(tmp_path / 'talk.srt.gz', 'rb') as f:
+        assert f.read() == expected.read_bytes()
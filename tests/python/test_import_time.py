@@ -0,0 +1,78 @@
+"""Import-time budget for stjlib and the converter scripts.
+
+Short-lived converter processes spend most of their time importing, so
+heavy dependencies must stay out of the import path until they are used.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+PYTHONPATH = os.pathsep.join([
+    os.path.join(PROJECT_ROOT, 'vendor', 'python'),
+    os.path.join(PROJECT_ROOT, 'tools', 'python'),
+])
+
+# Generous budgets in seconds (cumulative -X importtime, best of 3 runs);
+# locally these modules import in well under a third of this
+IMPORT_BUDGETS = {
+    'stjlib': 0.15,
+    'stj_to_srt': 0.2,
+    'stj_convert': 0.25,
+}
+
+DEFERRED_MODULES = [
+    'iso639',
+    'stjlib.validation.validators',
+    'stjlib.chunks',
+    'stjlib.revisions',
+    'decimal',
+    'difflib',
+    'urllib.request',
+    'jsonschema',
+    'concurrent.futures',
+]
+
+
+def _python(*args):
+    env = dict(os.environ, PYTHONPATH=PYTHONPATH)
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True,
+    )
+
+
+def _import_seconds(module):
+    stderr = _python('-X', 'importtime', '-c', f'import {module}').stderr
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2].startswith('  '):
+            return int(parts[1]) / 1e6
+    raise AssertionError(f"no import time reported for {module}")
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS))
+def test_import_time_within_budget(module):
+    seconds = min(_import_seconds(module) for _ in range(3))
+    assert seconds < IMPORT_BUDGETS[module], f"import {module} took {seconds:.3f}s"
+
+
+@pytest.mark.parametrize("module", ['stjlib', 'stj_to_srt', 'stj_convert', 'stj_validator'])
+def test_heavy_modules_are_not_imported_eagerly(module):
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    assert _python('-c', code).stdout.strip() == ''
+
+
+def test_lazy_names_resolve():
+    code = (
+        "import stjlib, stjlib.validation as v; "
+        "assert all(getattr(stjlib, n) for n in stjlib.__all__); "
+        "assert all(getattr(v, n) for n in v.__all__); "
+        "assert set(stjlib.__all__) <= set(dir(stjlib))"
+    )
+    _python('-c', code)
@@ -0,0 +1,158 @@
+"""Tests for stjlib.chunks.merge_transcripts."""
+
+import io
+import json
+import random
+
+import pytest
+from stjlib import StandardTranscriptionJSON, merge_transcripts
+
+
+def _chunk(segments, speakers=None, styles=None, languages=None):
+    stj = {"version": "0.6.0", "transcript": {"speakers": speakers or [], "segments": segments}}
+    if styles is not None:
+        stj["transcript"]["styles"] = styles
+    if languages:
+        stj["metadata"] = {"languages": languages}
+    return io.StringIO(json.dumps({"stj": stj}))
+
+
+def _merge(inputs, **kwargs):
+    out = io.StringIO()
+    count, issues = merge_transcripts(inputs, out, **kwargs)
+    out.seek(0)
+    stj = StandardTranscriptionJSON.from_dict(json.load(out), validate=True)
+    return stj, count, issues
+
+
+def test_merge_interleaves_by_start_time_with_offsets():
+    a = _chunk([
+        {"text": "one", "start": 0.0, "end": 1.0},
+        {"text": "three", "start": 4.0, "end": 5.0},
+    ])
+    b = _chunk([
+        {"text": "two", "start": 0.5, "end": 1.5, "words": [
+            {"text": "two", "start": 0.5, "end": 1.5},
+        ]},
+    ])
+    stj, count, issues = _merge([a, b], offsets=[0, 2])
+
+    segments = stj.transcript.segments
+    assert count == 3
+    assert [s.text for s in segments] == ["one", "two", "three"]
+    assert (segments[1].start, segments[1].end) == (2.5, 3.5)
+    assert segments[1].words[0].start == 2.5
+    assert issues == []
+
+
+def test_merge_remaps_colliding_speaker_ids():
+    a = _chunk([{"text": "hi", "start": 0.0, "end": 1.0, "speaker_id": "S1"}],
+               speakers=[{"id": "S1", "name": "Alice"}])
+    b = _chunk([{"text": "hey", "start": 0.0, "end": 1.0, "speaker_id": "S1"}],
+               speakers=[{"id": "S1", "name": "Bob"}])
+    c = _chunk([{"text": "yo", "start": 0.0, "end": 1.0, "speaker_id": "S1"}],
+               speakers=[{"id": "S1", "name": "Bob"}])
+    stj, _, _ = _merge([a, b, c], offsets=[0, 10, 20])
+
+    assert [(s.id, s.name) for s in stj.transcript.speakers] == [("S1", "Alice"), ("S1-2", "Bob")]
+    assert [s.speaker_id for s in stj.transcript.segments] == ["S1", "S1-2", "S1-2"]
+
+
+def test_merge_deduplicates_seam_overlap():
+    a = _chunk([
+        {"text": "before", "start": 0.0, "end": 8.0},
+        {"text": "at the seam", "start": 9.0, "end": 10.5},
+    ], languages=["en"])
+    b = _chunk([
+        {"text": "At the  seam", "start": 0.0, "end": 0.6},
+        {"text": "after", "start": 1.0, "end": 2.0},
+    ], languages=["en", "fr"])
+    stj, count, issues = _merge([a, b], offsets=[0, 10])
+
+    assert [s.text for s in stj.transcript.segments] == ["before", "at the seam", "after"]
+    assert stj.transcript.segments[1].end == 10.6
+    assert stj.metadata.languages == ["en", "fr"]
+    assert count == 3
+    assert len(issues) == 1
+
+
+def test_merge_resolves_overlap_between_speakers():
+    a = _chunk([{"text": "first", "start": 0.0, "end": 2.2, "speaker_id": "A"}],
+               speakers=[{"id": "A"}, {"id": "B"}])
+    b = _chunk([{"text": "second", "start": 2.0, "end": 3.0, "speaker_id": "B"}],
+               speakers=[{"id": "A"}, {"id": "B"}])
+    stj, _, issues = _merge([a, b])
+
+    first, second = stj.transcript.segments
+    assert first.end == second.start == 2.0
+    assert issues
+
+
+def test_merge_keeps_contained_segments_of_other_speakers():
+    speakers = [{"id": "A"}, {"id": "B"}]
+    for offset, expected in [
+        # Both start together: the shorter goes first
+        (0, [("B", 0.0, 5.0, "interjection"), ("A", 5.0, 10.0, "long speech here")]),
+        # The earlier segment ends where the contained one starts
+        (2, [("A", 0.0, 2.0, "long speech here"), ("B", 2.0, 7.0, "interjection")]),
+    ]:
+        a = _chunk([{"text": "long speech here", "start": 0.0, "end": 10.0, "speaker_id": "A",
+                     "words": [{"text": "long", "start": 0.0, "end": 1.0},
+                               {"text": "speech", "start": 1.0, "end": 3.0},
+                               {"text": "here", "start": 6.0, "end": 9.0}]}],
+                   speakers=speakers)
+        b = _chunk([{"text": "interjection", "start": 0.0, "end": 5.0, "speaker_id": "B"}],
+                   speakers=speakers)
+        stj, count, issues = _merge([a, b], offsets=[0, offset])
+
+        segments = stj.transcript.segments
+        assert [(s.speaker_id, s.start, s.end, s.text) for s in segments] == expected
+        assert count == 2 and len(issues) == 1
+        for segment in segments:
+            assert all(segment.start <= w.start <= w.end <= segment.end
+                       for w in segment.words or [])
+
+
+def test_merge_keeps_one_of_two_segments_with_the_same_times():
+    a = _chunk([{"text": "yes", "start": 1.0, "end": 2.0, "speaker_id": "A"}],
+               speakers=[{"id": "A"}])
+    b = _chunk([{"text": "no", "start": 1.0, "end": 2.0}])
+    stj, count, issues = _merge([a, b])
+    assert [s.text for s in stj.transcript.segments] == ["yes"]
+    assert count == 1 and "dropped" in str(issues[0])
+
+
+def test_merge_never_writes_overlapping_segments_from_three_inputs():
+    def chunk(name, times):
+        return _chunk([{"text": f"{name}{i}", "start": start, "end": end}
+                       for i, (start, end) in enumerate(times)])
+
+    stj, count, issues = _merge([
+        chunk("a", [(0.1, 0.6), (0.6, 1.6), (1.6, 3.6), (3.6, 4.1)]),
+        chunk("b", [(0.1, 2.1)]),
+        chunk("c", [(2.0, 2.5), (2.8, 3.8)]),
+    ])
+    segments = stj.transcript.segments
+    assert count == 7 and sorted(s.text for s in segments) == [
+        "a0", "a1", "a2", "a3", "b0", "c0", "c1"]
+    assert all(x.end <= y.start for x, y in zip(segments, segments[1:]))
+    assert any("already written" in issue.message for issue in issues)
+
+    # Random chunks; _merge validates every result
+    rng = random.Random(0)
+    for _ in range(200):
+        inputs = []
+        for name in "abc":
+            times, start = [], 0.0
+            for _ in range(rng.randint(1, 4)):
+                start = round(start + rng.uniform(0, 1.5), 1)
+                end = round(start + rng.uniform(0.1, 2), 1)
+                times.append((start, end))
+                start = end
+            inputs.append(chunk(name, times))
+        _merge(inputs)
+
+
+def test_merge_requires_one_offset_per_input():
+    with pytest.raises(ValueError):
+        merge_transcripts([_chunk([])], io.StringIO(), offsets=[0, 1])
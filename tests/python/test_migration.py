@@ -0,0 +1,140 @@
+"""Tests for stjlib.migration and the stj-migrate tool."""
+
+import gzip
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+from stjlib import StandardTranscriptionJSON
+from stjlib.migration import (
+    LATEST_VERSION,
+    detect_version,
+    migrate_dict,
+    migrate_file,
+    migration_path,
+)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+EXAMPLES = os.path.join(PROJECT_ROOT, 'examples')
+
+
+def _example(version, name='complex'):
+    return os.path.join(EXAMPLES, version, f'{name}.stj.json')
+
+
+@pytest.mark.parametrize('version', ['v0.4.0', 'v0.5.0'])
+def test_migrated_examples_are_valid_latest_documents(tmp_path, version):
+    source = _example(version)
+    target = str(tmp_path / 'out.stj.json')
+    report = migrate_file(source, target)
+
+    assert report.source_version == version[1:]
+    assert report.changed and report.output == target
+    stj = StandardTranscriptionJSON.from_file(target, validate=True)
+    assert stj.version == LATEST_VERSION
+    assert len(stj.transcript.segments) == report.segments
+
+    # The streaming and in-memory paths agree
+    with open(source, encoding='utf-8') as f:
+        migrated, dict_report = migrate_dict(json.load(f))
+    with open(target, encoding='utf-8') as f:
+        assert json.load(f) == migrated
+    assert dict_report.changes == report.changes
+
+
+def test_unknown_fields_are_kept_by_both_paths(tmp_path):
+    document = {'stj': {
+        'version': '0.5.0',
+        'transcript': {'segments': [{'start': 0.0, 'end': 1.0, 'text': 'Hi'}], 'notes': 'keep?'},
+        'custom': {'x': 1},
+    }}
+    source = tmp_path / 'in.stj.json'
+    source.write_text(json.dumps(document))
+    report = migrate_file(str(source))
+
+    migrated, dict_report = migrate_dict(document)
+    assert json.loads(source.read_text()) == migrated
+    assert dict_report.changes == report.changes
+    assert migrated['stj']['metadata'] == {
+        'extensions': {'legacy': {'transcript.notes': 'keep?', 'custom': {'x': 1}}}}
+    assert 'notes' not in migrated['stj']['transcript']
+
+
+def test_step_transforms():
+    document = {
+        'metadata': {'transcriber': {'name': 't', 'version': '1'}, 'created_at': '2024-01-01T00:00:00Z',
+                     'languages': [], 'additional_info': {'note': 'kept'}},
+        'transcript': {
+            'speakers': [{'id': 'S1', 'additional_info': {'stj': {'a': 1}, 'bad key': 2}}],
+            'styles': [{'id': 'st', 'formatting': {'bold': True, 'background_color': '#000000',
+                                                  'font': 'Arial'},
+                        'positioning': {'align': 'center', 'line': '90%'}}],
+            'segments': [{'start': 0.0, 'end': 1.0, 'text': 'Hi', 'additional_info': {'x': {}}}],
+        },
+    }
+    migrated, report = migrate_dict(document)
+    stj = migrated['stj']
+
+    assert document['metadata']['additional_info'] == {'note': 'kept'}
+    assert stj['version'] == LATEST_VERSION
+    assert stj['metadata']['extensions'] == {'note': {'value': 'kept'}}
+    assert 'languages' not in stj['metadata'] and 'version' not in stj['metadata']
+    assert stj['transcript']['speakers'][0]['extensions'] == {
+        'stj_legacy': {'a': 1}, 'bad_key': {'value': 2}}
+    assert stj['transcript']['styles'][0] == {
+        'id': 'st',
+        'text': {'bold': True, 'background': '#000000'},
+        'display': {'align': 'center'},
+        'extensions': {'legacy': {'formatting': {'font': 'Arial'}, 'positioning': {'line': '90%'}}},
+    }
+    assert 'extensions' not in stj['transcript']['segments'][0]
+    assert report.changes['removed empty extensions'] == 1
+
+
+def test_detect_version_and_path():
+    assert detect_version(_example('v0.4.0')) == '0.4.0'
+    assert detect_version(_example('v0.5.0')) == '0.5.0'
+    assert detect_version(_example('latest')) == LATEST_VERSION
+    assert [step.target for step in migration_path('0.4.0')] == ['0.5.0', '0.6.0']
+    assert migration_path(LATEST_VERSION) == []
+    with pytest.raises(ValueError):
+        migration_path('0.3.0')
+
+
+def test_in_place_rewrites_only_outdated_files(tmp_path):
+    old = tmp_path / 'old.stj.json.gz'
+    with open(_example('v0.4.0'), 'rb') as src, gzip.open(old, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    current = tmp_path / 'current.stj.json'
+    shutil.copy(_example('latest'), current)
+    before = current.read_bytes()
+
+    assert migrate_file(str(old), dry_run=True).output is None
+    assert detect_version(str(old)) == '0.4.0'
+
+    report = migrate_file(str(old))
+    assert report.output == str(old)
+    assert detect_version(str(old)) == LATEST_VERSION
+    assert not migrate_file(str(current)).changed
+    assert current.read_bytes() == before
+    assert sorted(os.listdir(tmp_path)) == ['current.stj.json', 'old.stj.json.gz']
+
+
+def test_cli_reports_and_checks(tmp_path):
+    for version in ('v0.4.0', 'v0.5.0', 'v0.6.0'):
+        shutil.copy(_example(version), tmp_path / f'{version}.stj.json')
+
+    def run(*args):
+        return subprocess.run(['python', 'tools/python/stj_migrate.py', str(tmp_path), *args],
+                              capture_output=True, text=True, cwd=PROJECT_ROOT)
+
+    result = run('--check', '-j', '2')
+    assert result.returncode == 1, result.stdout
+    assert 'Would migrate 2/3 files' in result.stdout
+    assert 'renamed additional_info to extensions' in result.stdout
+
+    result = run('--in-place')
+    assert result.returncode == 0, result.stdout
+    assert run('--check').returncode == 0
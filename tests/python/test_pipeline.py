@@ -0,0 +1,77 @@
+"""Tests for stjlib.pipeline."""
+
+import json
+import os
+
+import pytest
+from stjlib import Milliseconds, Pipeline, Segment, Speaker, StandardTranscriptionJSON, Word
+from stjlib.pipeline import filter_confidence, normalize_text, remap_speakers, shift_times
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'latest', 'complex.stj.json')
+
+
+def _segment(text, confidences, start=1.0, **fields):
+    words = [Word(text=t, start=start + i * 0.5, end=start + i * 0.5 + 0.4, confidence=c)
+             for i, (t, c) in enumerate(zip(text.split(), confidences))]
+    return Segment(text=text, start=start, end=start + len(words) * 0.5, words=words, **fields)
+
+
+def test_builtin_stages():
+    segment = _segment('Um, so uh hello world', [0.9, 0.3, 0.9, 0.95, 0.8])
+    filtered = filter_confidence(0.5)(segment)
+    assert filtered.text == 'Um, uh hello world'
+    assert [w.text for w in filtered.words] == ['Um,', 'uh', 'hello', 'world']
+    assert len(segment.words) == 5  # the input is left unchanged
+    assert filter_confidence(0.5)(_segment('a', [0.9], confidence=0.2)) is None
+    assert filter_confidence(0.99)(segment) is None
+    with pytest.raises(ValueError):
+        filter_confidence(1.5)
+
+    normalized = normalize_text()(filtered)
+    assert normalized.text == 'hello world' and len(normalized.words) == 2
+    assert normalize_text()(Segment(text='  Hmm   yes  UM ', start=0, end=1)).text == 'yes'
+    assert normalize_text()(Segment(text='um', start=0, end=1)) is None
+
+    shifted = shift_times(2.5)(segment)
+    assert (shifted.start, shifted.words[0].end) == (3.5, 3.9)
+    exact = shift_times(-0.1)(Segment(text='a', start=Milliseconds(1000), end=Milliseconds(1200)))
+    assert exact.start == Milliseconds(900) and isinstance(exact.end, Milliseconds)
+
+
+def test_speaker_remapping_merges_speakers():
+    stage = remap_speakers({'A': 'Host', 'B': 'Host', 'C': 'D', 'E': None})
+    speakers = [Speaker(id=i, name=i.lower()) for i in 'ABCDE']
+    assert [(s.id, s.name) for s in stage.speakers(speakers)] == [
+        ('Host', 'a'), ('D', 'd')]
+    assert stage(Segment(text='x', speaker_id='B')).speaker_id == 'Host'
+    assert stage(Segment(text='x', speaker_id='E')).speaker_id is None
+    assert stage(Segment(text='x', speaker_id='Z')).speaker_id == 'Z'
+
+
+def test_run_streams_once_and_matches_in_memory(tmp_path):
+    with open(COMPLEX, encoding='utf-8') as f:
+        speaker = json.load(f)['stj']['transcript']['speakers'][0]['id']
+    pipeline = Pipeline([filter_confidence(0.925), remap_speakers({speaker: 'Renamed'})])
+    pipeline.then(shift_times(10))
+
+    target = str(tmp_path / 'out.stj.json.gz')
+    result = pipeline.run(COMPLEX, target)
+    in_memory = StandardTranscriptionJSON.from_file(COMPLEX)
+    kept = pipeline.apply(in_memory)
+
+    streamed = StandardTranscriptionJSON.from_file(target)
+    assert result.segments_written == kept < result.segments_read
+    assert streamed.to_dict() == in_memory.to_dict()
+    assert 'Renamed' in [s.id for s in streamed.transcript.speakers]
+    assert os.listdir(tmp_path) == ['out.stj.json.gz']
+
+    # In place, with a stage that fails part way through
+    def fail(segment):
+        raise RuntimeError('stop')
+
+    with pytest.raises(RuntimeError):
+        Pipeline([fail]).run(target)
+    assert os.listdir(tmp_path) == ['out.stj.json.gz']
+    assert Pipeline().run(target) == (kept, kept)
+    assert StandardTranscriptionJSON.from_file(target).to_dict() == in_memory.to_dict()
@@ -0,0 +1,81 @@
+"""Tests for stjlib.revisions: diff and apply_patch."""
+
+import json
+import os
+
+import pytest
+from stjlib import STJError, StandardTranscriptionJSON, apply_patch, diff
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+
+
+def _revision(edit):
+    with open(COMPLEX, encoding='utf-8') as f:
+        data = json.load(f)
+    edit(data["stj"])
+    return StandardTranscriptionJSON.from_dict(data)
+
+
+def _round_trip(old, new):
+    patch = diff(old, new)
+    # Patches are plain JSON
+    patch = json.loads(json.dumps(patch))
+    assert apply_patch(old, patch).to_dict() == new.to_dict()
+    return patch
+
+
+def test_identical_revisions_produce_empty_patch():
+    old = _revision(lambda stj: None)
+    assert diff(old, _revision(lambda stj: None)) == {"segments": []}
+
+
+def test_retext_and_retime_are_minimal():
+    def edit(stj):
+        segment = stj["transcript"]["segments"][1]
+        segment["text"] = segment["text"].replace("mathematician", "statistician")
+        stj["transcript"]["segments"][2]["end"] = 11.5
+
+    old = _revision(lambda stj: None)
+    patch = _round_trip(old, _revision(edit))
+
+    assert [(op["op"], op["index"]) for op in patch["segments"]] == [("retext", 1), ("retime", 2)]
+    assert patch["segments"][0]["text"] == [[10, 11, ["statistician"]]]
+    assert patch["segments"][1] == {"op": "retime", "index": 2, "start": 10.1, "end": 11.5}
+
+
+def test_word_time_shift_is_a_retime():
+    def edit(stj):
+        words = stj["transcript"]["segments"][0]["words"]
+        words[1]["start"] += 0.05
+
+    old = _revision(lambda stj: None)
+    patch = _round_trip(old, _revision(edit))
+    (op,) = patch["segments"]
+    assert op["op"] == "retime" and len(op["words"]) == len(old.transcript.segments[0].words)
+
+
+def test_insert_delete_update_and_header_changes():
+    def edit(stj):
+        segments = stj["transcript"]["segments"]
+        del segments[3]
+        segments.insert(0, {"text": "Intro", "start": 0.0, "end": 0.0, "is_zero_duration": True})
+        segments[-1]["speaker_id"] = "Speaker1"
+        segments.append({"text": "Applause", "start": 40.0, "end": 42.0})
+        stj["transcript"]["speakers"][0]["name"] = "Prof. Chuckles"
+
+    old = _revision(lambda stj: None)
+    patch = _round_trip(old, _revision(edit))
+
+    kinds = [op["op"] for op in patch["segments"]]
+    assert kinds.count("insert") == 2
+    assert kinds.count("delete") == 1
+    assert {"op": "update", "index": 6, "set": {"speaker_id": "Speaker1"}} in patch["segments"]
+    assert patch["speakers"][0]["name"] == "Prof. Chuckles"
+    assert "metadata" not in patch
+
+
+def test_apply_patch_rejects_mismatched_patch():
+    old = _revision(lambda stj: None)
+    with pytest.raises(STJError):
+        apply_patch(old, {"segments": [{"op": "delete", "index": 99}]})
@@ -0,0 +1,77 @@
+"""Tests for stjlib.chunks.split_transcript."""
+
+import io
+import json
+import os
+
+import pytest
+from stjlib import StandardTranscriptionJSON, merge_transcripts, split_transcript
+from stjlib.streaming import read_header
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+
+
+def _load(path):
+    return StandardTranscriptionJSON.from_file(path, validate=True)
+
+
+def test_split_by_duration_rebases_and_records_offset(tmp_path):
+    paths = split_transcript(COMPLEX, str(tmp_path), by="duration", size=10)
+
+    assert len(paths) == 3
+    first, second = _load(paths[0]), _load(paths[1])
+    assert first.metadata.extensions["shard"] == {"index": 0, "offset": 0.0}
+    assert second.metadata.extensions["shard"] == {"index": 1, "offset": 10.0}
+    assert second.transcript.segments[0].start == 0.1
+    assert all(s.start < 10 for s in first.transcript.segments)
+
+
+def test_split_carries_only_referenced_speakers_and_styles(tmp_path):
+    original = _load(COMPLEX)
+    paths = split_transcript(original, str(tmp_path), by="segments", size=2)
+
+    assert len(paths) == 4
+    for path in paths:
+        transcript = _load(path).transcript
+        used_speakers = {s.speaker_id for s in transcript.segments if s.speaker_id}
+        used_styles = {s.style_id for s in transcript.segments if s.style_id}
+        assert {s.id for s in transcript.speakers} == used_speakers
+        assert {s.id for s in transcript.styles or []} == used_styles
+
+
+def test_split_by_bytes_and_count(tmp_path):
+    paths = split_transcript(COMPLEX, str(tmp_path / "bytes"), by="bytes", size=500)
+    for path in paths[:-1]:
+        with open(path, encoding='utf-8') as f:
+            segments = json.load(f)["stj"]["transcript"]["segments"]
+        assert len(segments) == 1 or sum(len(json.dumps(s)) for s in segments) <= 500
+
+    assert len(split_transcript(COMPLEX, str(tmp_path / "count"), by="segments", count=3)) == 3
+
+
+def test_split_then_merge_restores_original(tmp_path):
+    original = _load(COMPLEX)
+    paths = split_transcript(COMPLEX, str(tmp_path), by="duration", count=3, prefix="part")
+    assert [os.path.basename(p) for p in paths] == [
+        "part-000.stj.json", "part-001.stj.json", "part-002.stj.json",
+    ]
+
+    out = io.StringIO()
+    merge_transcripts(paths, out)
+    out.seek(0)
+    merged = read_header(io.StringIO(out.getvalue()))
+    assert merged.metadata == original.metadata
+    merged = StandardTranscriptionJSON.from_dict(json.loads(out.getvalue()), validate=True)
+    assert [s.to_dict() for s in merged.transcript.segments] == [
+        s.to_dict() for s in original.transcript.segments
+    ]
+
+
+def test_split_rejects_bad_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        split_transcript(COMPLEX, str(tmp_path), by="words", size=1)
+    with pytest.raises(ValueError):
+        split_transcript(COMPLEX, str(tmp_path), size=10, count=2)
+    with pytest.raises(ValueError):
+        split_transcript(COMPLEX, str(tmp_path), size=0)
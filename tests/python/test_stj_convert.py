@@ -0,0 +1,83 @@
+"""Tests for the stj-convert batch conversion CLI."""
+
+import os
+import shutil
+import subprocess
+
+from stj_convert import duplicate_outputs, output_path
+from stj_inputs import expand_inputs
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+TOOLS_DIR = os.path.join(PROJECT_ROOT, 'tools', 'python')
+EXAMPLES_DIR = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0')
+
+
+def _copy_examples(tmp_path, names):
+    for name in names:
+        shutil.copy(os.path.join(EXAMPLES_DIR, f'{name}.stj.json'), tmp_path / f'{name}.stj.json')
+
+
+def test_expand_inputs_directories_globs_and_duplicates(tmp_path):
+    _copy_examples(tmp_path, ['simple', 'complex'])
+    (tmp_path / 'nested').mkdir()
+    shutil.copy(tmp_path / 'simple.stj.json', tmp_path / 'nested' / 'deep.stj.json')
+
+    files = expand_inputs([str(tmp_path), str(tmp_path / '*.stj.json')])
+    names = sorted(os.path.basename(f) for f in files)
+    assert names == ['complex.stj.json', 'deep.stj.json', 'simple.stj.json']
+
+
+def test_output_path_strips_stj_suffix(tmp_path):
+    assert output_path('a/b/talk.stj.json', 'srt') == os.path.join('a/b', 'talk.srt')
+    assert output_path('talk.json', 'vtt', str(tmp_path)) == os.path.join(str(tmp_path), 'talk.vtt')
+
+
+def test_cli_matches_single_format_tools(tmp_path):
+    _copy_examples(tmp_path, ['simple', 'complex'])
+    out_dir = tmp_path / 'out'
+    result = subprocess.run(
+        ['python', os.path.join(TOOLS_DIR, 'stj_convert.py'), str(tmp_path),
+         '-f', 'srt,vtt,ass', '-o', str(out_dir), '-j', '2'],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Converted 2/2 files (6 outputs)" in result.stdout
+
+    for fmt in ('srt', 'vtt', 'ass'):
+        single = tmp_path / f'single.{fmt}'
+        subprocess.run(
+            ['python', os.path.join(TOOLS_DIR, f'stj_to_{fmt}.py'),
+             str(tmp_path / 'complex.stj.json'), str(single)],
+            check=True, capture_output=True,
+        )
+        assert (out_dir / f'complex.{fmt}').read_bytes() == single.read_bytes()
+
+
+def test_cli_refuses_inputs_sharing_output_files(tmp_path):
+    for directory in ('a', 'b'):
+        (tmp_path / directory).mkdir()
+        shutil.copy(os.path.join(EXAMPLES_DIR, 'simple.stj.json'),
+                    tmp_path / directory / 'ep1.stj.json')
+    files = expand_inputs([str(tmp_path)])
+    assert duplicate_outputs(files, str(tmp_path / 'out')) == [files]
+    assert duplicate_outputs(files, None) == []
+
+    result = subprocess.run(
+        ['python', os.path.join(TOOLS_DIR, 'stj_convert.py'), str(tmp_path),
+         '-o', str(tmp_path / 'out')],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 1
+    assert "would be written to the same output files" in result.stdout
+    assert not os.listdir(tmp_path / 'out')
+
+
+def test_cli_reports_failures(tmp_path):
+    (tmp_path / 'broken.stj.json').write_text('{"invalid": "json"}')
+    result = subprocess.run(
+        ['python', os.path.join(TOOLS_DIR, 'stj_convert.py'), str(tmp_path / 'broken.stj.json')],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 1
+    assert "FAILED" in result.stdout
+    assert "Converted 0/1 files" in result.stdout
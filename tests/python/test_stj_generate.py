@@ -0,0 +1,87 @@
+"""Tests for the synthetic corpus generator in tools/python/stj_generate.py."""
+
+import io
+import json
+
+import pytest
+from stjlib import StandardTranscriptionJSON
+from stjlib.streaming import iter_segments
+from stjlib.validation import ValidationSeverity
+
+from stj_generate import DEFECTS, SHAPES, CorpusSpec, extension_tree, write_corpus
+
+
+def _generate(spec):
+    buf = io.StringIO()
+    count = write_corpus(spec, buf)
+    return count, buf.getvalue()
+
+
+def _issues(text):
+    stj = StandardTranscriptionJSON.from_dict(json.loads(text))
+    return stj.validate(raise_exception=False)
+
+
+def _errors(text):
+    return [i for i in _issues(text) if i.severity == ValidationSeverity.ERROR]
+
+
+def test_generation_is_deterministic():
+    spec = dict(words=500, speakers=3, languages=3, precision=True)
+    assert _generate(CorpusSpec(**spec)) == _generate(CorpusSpec(**spec))
+    assert _generate(CorpusSpec(seed=1, **spec)) != _generate(CorpusSpec(**spec))
+
+
+@pytest.mark.parametrize("shape", sorted(set(SHAPES) - {"dense-overlaps"}))
+def test_shapes_are_valid(shape):
+    # Scale the shapes down so the test stays fast
+    spec = CorpusSpec.for_shapes(
+        [shape], words=400,
+        speakers=50 if shape == "many-speakers" else None,
+        extension_depth=30 if shape == "deep-extensions" else None,
+    )
+    count, text = _generate(spec)
+
+    assert _errors(text) == []
+    segments = list(iter_segments(io.StringIO(text)))
+    assert len(segments) == count
+    assert sum(len(s.words) for s in segments) == 400
+
+
+def test_language_switching_changes_language_every_segment():
+    _, text = _generate(CorpusSpec.for_shapes(["language-switching"], words=300))
+    languages = [s.language for s in iter_segments(io.StringIO(text))]
+    assert all(a != b for a, b in zip(languages, languages[1:]))
+
+
+def test_dense_overlaps_overlap_every_segment():
+    _, text = _generate(CorpusSpec.for_shapes(["dense-overlaps"], words=300))
+    segments = list(iter_segments(io.StringIO(text)))
+    assert all(b.start < a.end for a, b in zip(segments, segments[1:]))
+    assert _errors(text)
+
+
+@pytest.mark.parametrize("defect", DEFECTS)
+def test_defects_are_reported(defect):
+    _, text = _generate(CorpusSpec(words=200, defects=[defect], defect_rate=1))
+    issues = _issues(text)
+    if defect == "text-mismatch":
+        # The validator reports word/text mismatches as warnings
+        assert issues
+    else:
+        assert any(i.severity == ValidationSeverity.ERROR for i in issues)
+
+
+def test_extension_tree_depth():
+    tree = extension_tree(3, "x")
+    assert tree == {"level-0": {"level": 0, "label": "x", "extensions": {
+        "level-1": {"level": 1, "label": "x", "extensions": {
+            "level-2": {"level": 2, "label": "x"}}}}}}
+    assert extension_tree(0, "x") is None
+
+
+def test_spec_rejects_unknown_values():
+    with pytest.raises(ValueError):
+        CorpusSpec(defects=["nope"])
+    with pytest.raises(ValueError):
+        CorpusSpec.for_shapes(["nope"])
@@ -0,0 +1,124 @@
+"""Tests for cue re-segmentation and karaoke output in tools/python/stj_resegment.py."""
+
+import argparse
+import io
+
+import pytest
+from stjlib import Segment, Speaker, Word
+
+from stj_resegment import (
+    CueLimits,
+    TimedCue,
+    add_resegment_arguments,
+    ass_karaoke_text,
+    limits_from_args,
+    resegment,
+    vtt_karaoke_text,
+)
+from stj_writers import ASSWriter, SRTWriter, VTTWriter
+
+
+def _timed_segment(words, speaker_id=None, step=0.5):
+    timed = [
+        Word(start=round(i * step, 3), end=round((i + 1) * step, 3), text=text)
+        for i, text in enumerate(words)
+    ]
+    return Segment(
+        text=' '.join(words), start=0.0, end=timed[-1].end,
+        words=timed, speaker_id=speaker_id,
+    )
+
+
+def test_resegment_respects_line_and_cue_limits():
+    words = "one two three four five six seven eight nine ten eleven twelve".split()
+    limits = CueLimits(max_chars=10, max_lines=2, max_duration=100)
+    cues = list(resegment([_timed_segment(words)], limits))
+
+    assert len(cues) > 1
+    for cue in cues:
+        assert len(cue.lines) <= 2
+        assert all(len(line) <= 10 for line in cue.text.split('\n'))
+    # Every word appears exactly once, in order
+    assert ' '.join(cue.text.replace('\n', ' ') for cue in cues) == ' '.join(words)
+
+
+def test_resegment_splits_on_duration():
+    words = ["w%d" % i for i in range(10)]
+    cues = list(resegment([_timed_segment(words, step=1.0)], CueLimits(max_duration=3)))
+
+    assert [(cue.start_ms, cue.end_ms) for cue in cues] == [
+        (0, 3000), (3000, 6000), (6000, 9000), (9000, 10000),
+    ]
+
+
+def test_resegment_keeps_overlong_word_in_its_own_cue():
+    segment = _timed_segment(["a", "incomprehensibilities", "b"])
+    cues = list(resegment([segment], CueLimits(max_chars=5, max_lines=1)))
+    assert [cue.text for cue in cues] == ["a", "incomprehensibilities", "b"]
+
+
+def test_resegment_interpolates_untimed_words():
+    segment = Segment(text="aaa bbb", start=1.0, end=2.0)
+    cues = list(resegment([segment], CueLimits(max_chars=3, max_lines=1)))
+
+    assert [(cue.text, cue.start_ms, cue.end_ms) for cue in cues] == [
+        ("aaa", 1000, 1500), ("bbb", 1500, 2000),
+    ]
+
+
+def test_resegment_skips_untimed_segments():
+    assert list(resegment([Segment(text="No timing")])) == []
+
+
+def test_cue_limits_reject_non_positive_values():
+    with pytest.raises(ValueError):
+        CueLimits(max_chars=0)
+
+    parser = argparse.ArgumentParser()
+    add_resegment_arguments(parser)
+    assert limits_from_args(parser.parse_args(['--max-lines', '3'])).max_chars == 42
+    for option in ('--max-chars', '--max-lines', '--max-duration'):
+        with pytest.raises(ValueError):
+            limits_from_args(parser.parse_args([option, '0']))
+        with pytest.raises(SystemExit):
+            limits_from_args(parser.parse_args([option, '0']), parser)
+
+
+def _cue(*lines):
+    cue = TimedCue(speaker_id="S1")
+    cue.lines = [list(line) for line in lines]
+    return cue
+
+
+def test_ass_karaoke_text_includes_gaps():
+    cue = _cue([("Hi", 0, 250), ("there", 400, 900)], [("friend", 900, 1500)])
+    assert ass_karaoke_text(cue) == "{\\k25}Hi {\\k15}{\\k50}there\n{\\k60}friend"
+
+
+def test_vtt_karaoke_text_uses_inline_timestamps():
+    cue = _cue([("Hi", 0, 250), ("there", 400, 900)], [("friend", 900, 1500)])
+    assert vtt_karaoke_text(cue) == "Hi <00:00:00.400>there\n<00:00:00.900>friend"
+
+
+def test_writers_emit_resegmented_cues():
+    cue = _cue([("Hi", 1000, 1250), ("there", 1400, 1900)])
+
+    buf = io.StringIO()
+    with SRTWriter(buf) as writer:
+        writer.write_cues([cue])
+    assert buf.getvalue() == "1\n00:00:01,000 --> 00:00:01,900\nS1: Hi there\n\n"
+
+    buf = io.StringIO()
+    with VTTWriter(buf) as writer:
+        writer.write_cues([cue], text=vtt_karaoke_text)
+    assert buf.getvalue().endswith(
+        "00:00:01.000 --> 00:00:01.900\nS1: Hi <00:00:01.400>there\n"
+    )
+
+    buf = io.StringIO()
+    with ASSWriter(buf, speakers=[Speaker(id="S1", name="Host")]) as writer:
+        writer.write_cues([cue], text=ass_karaoke_text)
+    assert buf.getvalue().endswith(
+        "Dialogue: 0,0:00:01.00,0:00:01.90,Default,Host,0000,0000,0000,,"
+        "{\\k25}Hi {\\k15}{\\k50}there\n"
+    )
@@ -0,0 +1,142 @@
+"""Tests for the stj-serve HTTP service."""
+
+import http.client
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from stj_serve import Metrics, STJService
+from stj_to_srt import write_srt
+from stjlib import StandardTranscriptionJSON
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    service = STJService(('127.0.0.1', 0), jobs=1, max_pending=2, max_body=1024 * 1024,
+                         spool_dir=str(tmp_path_factory.mktemp('spool')))
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    yield service
+    service.shutdown()
+    service.server_close()
+
+
+def _request(server, method, path, body=None, headers=None, chunked=False):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        conn.request(method, path, body=body, headers=headers or {}, encode_chunked=chunked)
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def _document():
+    with open(COMPLEX, 'rb') as f:
+        return f.read()
+
+
+def test_validate_reports_issues(server):
+    status, _, body = _request(server, 'POST', '/validate', _document())
+    assert status == 200
+    assert json.loads(body) == {'valid': True, 'issues': []}
+
+    data = json.loads(_document())
+    data['stj']['transcript']['segments'][0]['speaker_id'] = 'missing'
+    status, _, body = _request(server, 'POST', '/validate', json.dumps(data))
+    result = json.loads(body)
+    assert status == 200 and not result['valid']
+    assert any('missing' in issue['message'] for issue in result['issues'])
+
+    status, _, _ = _request(server, 'POST', '/validate', b'{not json')
+    assert status == 400
+
+
+def test_convert_streams_chunked_request(server, tmp_path):
+    document = _document()
+
+    def chunks():
+        for start in range(0, len(document), 500):
+            yield document[start:start + 500]
+
+    status, headers, body = _request(server, 'POST', '/convert/srt', chunks(),
+                                     {'Transfer-Encoding': 'chunked'}, chunked=True)
+    assert status == 200
+    assert headers['Content-Type'].startswith('application/x-subrip')
+
+    expected = tmp_path / 'expected.srt'
+    write_srt(StandardTranscriptionJSON.from_file(COMPLEX), str(expected))
+    assert body == expected.read_bytes()
+    assert os.listdir(server.spool_dir) == []
+
+
+def test_errors_and_backpressure(server):
+    status, _, body = _request(server, 'POST', '/convert/docx', _document())
+    assert status == 404 and 'srt' in json.loads(body)['formats']
+
+    # Rejected from the declared length, before the body is read
+    status, _, _ = _request(server, 'POST', '/validate', b'{}',
+                            {'Content-Length': str(2 * 1024 * 1024)})
+    assert status == 413
+
+    server.slots.acquire()
+    server.slots.acquire()
+    try:
+        status, headers, _ = _request(server, 'POST', '/validate', _document())
+    finally:
+        server.slots.release()
+        server.slots.release()
+    # Unwanted bodies are left unread and the connection closed
+    assert status == 503 and headers['Retry-After'] == '1'
+    assert headers['Connection'] == 'close'
+    status, headers, _ = _request(server, 'POST', '/nowhere', _document())
+    assert status == 404 and headers['Connection'] == 'close'
+
+
+def test_chunked_body_over_the_limit_is_rejected(server):
+    piece = b'x' * 65536
+    chunk = b'%x\r\n%s\r\n' % (len(piece), piece)
+    with socket.create_connection(server.server_address[:2], timeout=30) as sock:
+        sock.sendall(b'POST /validate HTTP/1.1\r\nHost: test\r\n'
+                     b'Transfer-Encoding: chunked\r\n\r\n')
+        # One chunk more than the 1 MiB limit, and the body is never ended
+        for _ in range(17):
+            sock.sendall(chunk)
+        response = sock.makefile('rb').read()
+    assert response.startswith(b'HTTP/1.1 413 ')
+    assert b'Connection: close' in response
+
+
+def test_metrics_histograms(server):
+    _request(server, 'POST', '/validate', _document())
+    status, _, body = _request(server, 'GET', '/metrics')
+    text = body.decode('utf-8')
+    assert status == 200
+    assert 'stj_requests_total{endpoint="validate",status="200"}' in text
+    assert 'stj_request_duration_seconds_bucket{endpoint="validate",le="+Inf"}' in text
+    assert 'stj_request_duration_seconds_count{endpoint="validate"}' in text
+    assert 'stj_requests_in_flight 0' in text
+
+
+def test_in_flight_gauge_is_updated_atomically():
+    metrics = Metrics()
+
+    def cycle():
+        for _ in range(10000):
+            metrics.request_started()
+            metrics.request_finished()
+
+    threads = [threading.Thread(target=cycle) for _ in range(8)]
+    metrics.request_started()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.in_flight == 1
+    assert 'stj_requests_in_flight 1' in metrics.render()
@@ -0,0 +1,86 @@
+"""Tests for the watch mode of stj-validator and stj-convert."""
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+from stj_convert import convert_file
+from stj_validator import check_file
+from stj_watch import FileWatcher, watch
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+TOOLS_DIR = os.path.join(PROJECT_ROOT, 'tools', 'python')
+SIMPLE = os.path.join(PROJECT_ROOT, 'examples', 'latest', 'simple.stj.json')
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'latest', 'complex.stj.json')
+
+
+def _settled_copy(source, target):
+    shutil.copy(source, target)
+    past = time.time() - 60
+    os.utime(target, (past, past))
+
+
+def _changes_within(watcher, seconds):
+    found = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        found.extend(watcher.changes(0.05))
+    return [os.path.basename(p) for p in found]
+
+
+@pytest.mark.parametrize('use_inotify', [True, False])
+def test_watcher_reports_content_changes_once_settled(tmp_path, use_inotify):
+    _settled_copy(SIMPLE, tmp_path / 'a.stj.json')
+    watcher = FileWatcher([str(tmp_path)], debounce=0.2, use_inotify=use_inotify)
+    try:
+        assert [os.path.basename(p) for p in watcher.changes(0.05)] == ['a.stj.json']
+        assert watcher.changes(0.05) == []
+
+        # Touching a file does not make it changed
+        os.utime(tmp_path / 'a.stj.json')
+        assert _changes_within(watcher, 0.5) == []
+
+        # Rapid saves are reported once, after the debounce period
+        for i in range(3):
+            with open(tmp_path / 'a.stj.json', 'a') as f:
+                f.write(' ' * (i + 1))
+            time.sleep(0.05)
+        (tmp_path / 'nested').mkdir()
+        shutil.copy(COMPLEX, tmp_path / 'nested' / 'b.stj.json')
+        (tmp_path / 'notes.txt').write_text('not a transcript')
+        assert sorted(_changes_within(watcher, 1.0)) == ['a.stj.json', 'b.stj.json']
+    finally:
+        watcher.close()
+
+
+def test_watch_processes_changed_files(tmp_path):
+    _settled_copy(SIMPLE, tmp_path / 'good.stj.json')
+    (tmp_path / 'bad.stj.json').write_text('{"stj": {}}')
+    results = []
+    processed = watch([str(tmp_path / '*.stj.json')], check_file, report=results.append,
+                      jobs=1, debounce=0, batches=1)
+    assert processed == 2
+    by_name = {os.path.basename(r[0]): r for r in results}
+    assert by_name['good.stj.json'][1:] == ([], None)
+    assert by_name['bad.stj.json'][2]
+
+    results = []
+    out_dir = str(tmp_path / 'out')
+    os.mkdir(out_dir)
+    watch([str(tmp_path / 'good.stj.json')], convert_file, (['srt'], out_dir), results.append,
+          jobs=2, debounce=0, use_inotify=False, batches=1)
+    assert [r[1] for r in results] == [[os.path.join(out_dir, 'good.srt')]]
+    assert os.path.exists(os.path.join(out_dir, 'good.srt'))
+
+
+def test_watch_mode_does_not_import_the_converter(tmp_path):
+    code = ("import sys, stj_validator, stj_watch\n"
+            "watcher = stj_watch.FileWatcher([sys.argv[1]], use_inotify=False)\n"
+            "watcher.changes(0)\n"
+            "print('stj_convert' in sys.modules)")
+    result = subprocess.run([sys.executable, '-c', code, str(tmp_path)], cwd=TOOLS_DIR,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
@@ -0,0 +1,152 @@
+"""Tests for the streaming subtitle writers in tools/python/stj_writers.py."""
+
+import io
+import xml.etree.ElementTree as ET
+from datetime import timedelta
+
+import srt
+import webvtt
+from stjlib import Segment, Speaker, StandardTranscriptionJSON, Style
+from stjlib.importers import import_vtt
+
+from stj_writers import (
+    ASSWriter,
+    SRTWriter,
+    TTMLWriter,
+    VTTWriter,
+    format_ass_timestamp,
+    format_srt_timestamp,
+    format_vtt_timestamp,
+    seconds_to_ms,
+)
+
+SEGMENTS = [
+    Segment(text="Hello, world!", start=0.0, end=5.1, speaker_id="S1"),
+    Segment(text="Second line\nwith a break", start=5.1, end=10.29),
+    Segment(text="Blank\n\nline inside", start=10.29, end=12.001),
+    Segment(text="Zero", start=13.0, end=13.0, is_zero_duration=True),
+    Segment(text="   ", start=14.0, end=15.0),
+    Segment(text="Long", start=3599.999, end=3723.456, speaker_id="S2"),
+]
+
+
+def _write(writer_cls, segments, **kwargs):
+    buf = io.StringIO()
+    with writer_cls(buf, **kwargs) as writer:
+        writer.write_segments(segments)
+    return buf.getvalue()
+
+
+def test_seconds_to_ms_is_exact():
+    assert seconds_to_ms(5.1) == 5100
+    assert seconds_to_ms(10.29) == 10290
+    assert seconds_to_ms(1.001) == 1001
+    assert seconds_to_ms(999999.999) == 999999999
+
+
+def test_timestamp_formats():
+    ms = 3723456
+    assert format_srt_timestamp(ms) == "01:02:03,456"
+    assert format_vtt_timestamp(ms) == "01:02:03.456"
+    assert format_ass_timestamp(ms) == "1:02:03.45"
+    assert format_srt_timestamp(0) == "00:00:00,000"
+
+
+def test_srt_writer_matches_srt_compose():
+    subtitles = []
+    for index, seg in enumerate(SEGMENTS, start=1):
+        content = f"{seg.speaker_id}: {seg.text}" if seg.speaker_id else seg.text
+        subtitles.append(srt.Subtitle(
+            index=index,
+            start=timedelta(seconds=seg.start),
+            end=timedelta(seconds=seg.end),
+            content=content,
+        ))
+    assert _write(SRTWriter, SEGMENTS) == srt.compose(subtitles)
+
+
+def test_vtt_writer_matches_webvtt():
+    vtt = webvtt.WebVTT()
+    for seg in SEGMENTS:
+        content = f"{seg.speaker_id}: {seg.text}" if seg.speaker_id else seg.text
+        vtt.captions.append(webvtt.Caption(
+            format_vtt_timestamp(seconds_to_ms(seg.start)),
+            format_vtt_timestamp(seconds_to_ms(seg.end)),
+            content,
+        ))
+    expected = io.StringIO()
+    vtt.write(expected)
+    assert _write(VTTWriter, SEGMENTS) == expected.getvalue()
+
+
+def test_ass_writer_resolves_speaker_names():
+    speakers = [Speaker(id="S1", name="Alice"), Speaker(id="S2")]
+    output = _write(ASSWriter, SEGMENTS, speakers=speakers)
+    assert output.startswith("[Script Info]\n")
+    dialogues = [line for line in output.splitlines() if line.startswith("Dialogue:")]
+    assert len(dialogues) == len(SEGMENTS)
+    assert dialogues[0] == "Dialogue: 0,0:00:00.00,0:00:05.10,Default,Alice,0000,0000,0000,,Hello, world!"
+    assert dialogues[1].endswith(",Second line\\Nwith a break")
+    assert ",Default,S2," in dialogues[-1]
+
+
+TT = "{http://www.w3.org/ns/ttml}"
+TTS = "{http://www.w3.org/ns/ttml#styling}"
+TTM = "{http://www.w3.org/ns/ttml#metadata}"
+XML = "{http://www.w3.org/XML/1998/namespace}"
+
+
+def test_ttml_writer_maps_styles_and_speakers():
+    styles = [
+        Style(
+            id="loud",
+            text={"color": "#FF0000", "opacity": "50%", "bold": True, "size": "120%"},
+            display={"align": "left", "vertical": "top", "position": {"x": "10%", "y": "5%"}},
+        ),
+        Style(id="plain", display={"align": "right"}),
+    ]
+    segments = [
+        Segment(text="Fish & <chips>\nplease", start=0.0, end=1.5, speaker_id="S1", style_id="loud"),
+        Segment(text="Bonjour", start=1.5, end=2.0, style_id="plain", language="fr"),
+    ]
+    output = _write(TTMLWriter, segments, styles=styles,
+                    speakers=[Speaker(id="S1", name="Alice")], language="en")
+
+    root = ET.fromstring(output.encode("utf-8"))
+    assert root.get(XML + "lang") == "en"
+    style = root.find(f"{TT}head/{TT}styling/{TT}style[@{XML}id='style-loud']")
+    assert style.get(TTS + "color") == "#FF000080"
+    assert style.get(TTS + "fontWeight") == "bold"
+    assert style.get(TTS + "fontSize") == "120%"
+    assert style.get(TTS + "textAlign") == "left"
+    region = root.find(f"{TT}head/{TT}layout/{TT}region[@{XML}id='region-1']")
+    assert region.get(TTS + "origin") == "10% 5%"
+    assert region.get(TTS + "extent") == "90% 95%"
+    assert region.get(TTS + "displayAlign") == "before"
+
+    first, second = root.iter(TT + "p")
+    assert (first.get("begin"), first.get("end")) == ("00:00:00.000", "00:00:01.500")
+    assert first.get("style") == "style-loud"
+    assert first.get("region") == "region-1"
+    assert first.get(TTM + "agent") == "speaker-S1"
+    assert "".join(first.itertext()) == "Fish & <chips>please"
+    assert len(first.findall(TT + "br")) == 1
+    assert second.get("region") == "region-default"
+    assert second.get(XML + "lang") == "fr"
+
+
+def test_ttml_region_of_a_single_axis_position(tmp_path):
+    vtt = tmp_path / "placed.vtt"
+    vtt.write_text("WEBVTT\n\n00:01.000 --> 00:02.000 line:80%\nDown here\n\n"
+                   "00:02.000 --> 00:03.000 position:30%\nOver there\n", encoding="utf-8")
+    stj_path = tmp_path / "placed.stj.json"
+    import_vtt(str(vtt), str(stj_path))
+    stj = StandardTranscriptionJSON.from_file(str(stj_path), validate=True)
+    assert stj.transcript.styles[0].display["position"] == {"y": "80%"}
+
+    output = _write(TTMLWriter, stj.transcript.segments, styles=stj.transcript.styles)
+    root = ET.fromstring(output.encode("utf-8"))
+    regions = root.findall(f"{TT}head/{TT}layout/{TT}region")
+    origins = {r.get(f"{XML}id"): (r.get(TTS + "origin"), r.get(TTS + "extent")) for r in regions}
+    assert origins["region-1"] == ("10% 80%", "90% 20%")
+    assert origins["region-2"] == ("30% 10%", "70% 90%")
@@ -0,0 +1,127 @@
+"""Tests for stjlib.streaming: STJWriter, iter_segments, read_header and peek_header."""
+
+import io
+import json
+import os
+
+import pytest
+from stjlib import Segment, Speaker, StandardTranscriptionJSON, ValidationError
+from stjlib.streaming import STJWriter, iter_segments, peek_header, read_header
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def test_writer_matches_json_dump_of_document():
+    stj = StandardTranscriptionJSON.from_file(
+        os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+    )
+    for indent in (2, None):
+        buf = io.StringIO()
+        with STJWriter(buf, version=stj.version, metadata=stj.metadata,
+                       speakers=stj.transcript.speakers, styles=stj.transcript.styles,
+                       indent=indent) as writer:
+            writer.write_segments(stj.transcript.segments)
+        assert buf.getvalue() == json.dumps(stj.stj.to_dict(), indent=indent)
+
+
+def test_speakers_registered_while_streaming_are_written(tmp_path):
+    path = tmp_path / 'out.stj.json'
+    with STJWriter(str(path)) as writer:
+        writer.write_segment(Segment(text="Hello", start=0.0, end=1.0, speaker_id="S1"))
+        writer.add_speaker(Speaker(id="S1", name="Alice"))
+        writer.write_segment({"text": "Bye", "start": 1.0, "end": 2.0})
+
+    stj = StandardTranscriptionJSON.from_file(str(path), validate=True)
+    assert [s.text for s in stj.transcript.segments] == ["Hello", "Bye"]
+    assert stj.transcript.speakers[0].name == "Alice"
+
+
+def test_empty_writer_produces_parseable_json():
+    buf = io.StringIO()
+    STJWriter(buf).close()
+    data = json.loads(buf.getvalue())
+    assert data["stj"]["transcript"] == {"segments": [], "speakers": []}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_reader_streams_segments_and_header(chunk_size):
+    path = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+    stj = StandardTranscriptionJSON.from_file(path)
+
+    segments = list(iter_segments(path, chunk_size=chunk_size))
+    assert [s.to_dict() for s in segments] == [s.to_dict() for s in stj.transcript.segments]
+
+    with open(path, encoding='utf-8') as f:
+        header = read_header(f, chunk_size=chunk_size)
+    assert header.version == stj.version
+    assert header.metadata == stj.metadata
+    assert header.transcript.speakers == stj.transcript.speakers
+    assert header.transcript.styles == stj.transcript.styles
+    assert header.transcript.segments == []
+
+
+def test_reader_reads_writer_output_with_trailing_speakers():
+    buf = io.StringIO()
+    with STJWriter(buf, indent=None) as writer:
+        writer.write_segment(Segment(text="Hi", start=0.0, end=1.25, speaker_id="S1"))
+        writer.add_speaker(Speaker(id="S1"))
+
+    buf.seek(0)
+    assert [s.end for s in iter_segments(buf, chunk_size=3)] == [1.25]
+    buf.seek(0)
+    assert read_header(buf).transcript.speakers == [Speaker(id="S1")]
+
+
+def test_reader_pools_repeated_strings_in_a_bounded_pool(monkeypatch):
+    import stjlib.streaming as streaming
+
+    lines = [{"text": "a", "start": float(i), "end": i + 0.5, "speaker_id": "S1",
+              "extensions": {f"ns-{i}": {}}} for i in range(6)]
+    text = json.dumps({"stj": {"version": "0.6.0", "transcript": {"segments": lines}}})
+    first, second, *rest = iter_segments(io.StringIO(text))
+    assert second.speaker_id is first.speaker_id
+
+    monkeypatch.setattr(streaming, '_POOL_SIZE', 2)
+    segments = list(iter_segments(io.StringIO(text)))
+    assert [s.to_dict() for s in segments] == lines
+    assert segments[1].speaker_id is segments[0].speaker_id
+    assert segments[5].speaker_id is not segments[0].speaker_id
+
+
+def test_reader_rejects_malformed_json():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_segments(io.StringIO('{"stj": {"transcript": {"segments": [{"text": }]}}}')))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_peek_skips_transcript_before_metadata(tmp_path, chunk_size):
+    stj = StandardTranscriptionJSON.from_file(
+        os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+    )
+    data = stj.stj.to_dict()["stj"]
+    reordered = {"transcript": data["transcript"], "metadata": data["metadata"],
+                 "version": data["version"]}
+    path = tmp_path / 'reordered.stj.json'
+    path.write_text(json.dumps({"stj": reordered}, indent=2), encoding='utf-8-sig')
+
+    header = StandardTranscriptionJSON.peek(str(path))
+    assert header == (stj.version, stj.metadata)
+    with open(path, encoding='utf-8-sig') as f:
+        assert peek_header(f, chunk_size=chunk_size) == header
+
+
+def test_peek_stops_after_header():
+    # Nothing after the metadata is read, so the malformed transcript is never seen
+    text = '{"stj": {"version": "0.6.0", "metadata": {"languages": ["en"]}, "transcript": {]'
+    header = peek_header(io.StringIO(text), chunk_size=4)
+    assert header.version == "0.6.0"
+    assert header.metadata.languages == ["en"]
+
+    assert peek_header(io.StringIO('{"stj": {"version": "0.6.0"}}')) == ("0.6.0", None)
+
+
+def test_peek_requires_version(tmp_path):
+    path = tmp_path / 'noversion.stj.json'
+    path.write_text('{"stj": {"transcript": {"segments": []}}}', encoding='utf-8')
+    with pytest.raises(ValidationError):
+        StandardTranscriptionJSON.peek(str(path))
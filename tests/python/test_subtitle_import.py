@@ -0,0 +1,149 @@
+"""Tests for the SRT and WebVTT to STJ importers."""
+
+import os
+import subprocess
+
+from stjlib import StandardTranscriptionJSON, import_srt
+from stjlib.importers import parse_timestamp, split_speaker, strip_tags
+from stjlib.validation import ValidationSeverity
+
+from srt_to_stj import srt_to_stj
+from vtt_to_stj import vtt_to_stj
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+TOOLS_DIR = os.path.join(PROJECT_ROOT, 'tools', 'python')
+
+MESSY_SRT = """﻿1
+00:00:01,000 --> 00:00:02,500
+Alice: Hello there
+
+2
+00:00:02.000 --> 00:00:04,000
+{\\an8}<i>Overlapping</i> cue
+3
+00:00:04,000 --> 00:00:05,000
+Bob Smith: Missing blank line above
+
+garbage text
+
+4
+00:00:xx,000 --> 00:00:06,000
+Malformed timing
+
+5
+00:00:07,000 --> 00:00:07,000
+Zero
+"""
+
+MESSY_VTT = """WEBVTT - header text
+Kind: captions
+
+NOTE this is a comment
+spanning lines
+
+intro
+00:01.000 --> 00:02.000 align:start line:90% position:10% size:50%
+<v Roger Bingham>We are in New York City &amp; more</v>
+
+00:02.000 --> 00:03.500
+Plain <b>bold</b> text
+
+STYLE
+::cue { color: red }
+
+00:00:03.500 --> 00:00:04.000 align:start line:90% position:10%
+Same placement
+"""
+
+
+def test_parse_timestamp_variants():
+    assert parse_timestamp("01:02:03,456") == 3723456
+    assert parse_timestamp("02:03.4") == 123400
+    assert parse_timestamp(" 00:00:01.000 ") == 1000
+    assert parse_timestamp("00:61:00,000") is None
+    assert parse_timestamp("bogus") is None
+
+
+def test_speaker_and_tag_helpers():
+    assert split_speaker("Alice: hi") == ("Alice", "hi")
+    assert split_speaker("Well, then: hi") == (None, "Well, then: hi")
+    assert strip_tags("<v.loud Bob>Hi</v> &lt;3") == ("Hi <3", "Bob")
+
+
+def test_srt_import_recovers_from_malformed_input(tmp_path):
+    src = tmp_path / 'messy.srt'
+    src.write_text(MESSY_SRT, encoding='utf-8')
+    out = tmp_path / 'messy.stj.json'
+
+    count, issues = srt_to_stj(str(src), str(out), language='en', detect_speakers=True)
+    assert count == 4
+    messages = " | ".join(str(i) for i in issues)
+    assert "previous end trimmed" in messages
+    assert "Missing blank line" in messages
+    assert "Malformed cue timing" in messages
+    assert not any(i.severity == ValidationSeverity.ERROR for i in issues)
+
+    stj = StandardTranscriptionJSON.from_file(str(out), validate=True)
+    segments = stj.transcript.segments
+    assert [s.text for s in segments] == [
+        "Hello there", "Overlapping cue", "Missing blank line above", "Zero",
+    ]
+    assert segments[0].end == 2.0
+    assert segments[3].is_zero_duration is True
+    assert {s.id: s.name for s in stj.transcript.speakers} == {"Alice": None, "Bob_Smith": "Bob Smith"}
+    assert stj.transcript.styles[0].display == {"align": "center", "vertical": "top"}
+    assert stj.metadata.languages == ["en"]
+
+
+def test_vtt_import_maps_voices_and_cue_settings(tmp_path):
+    src = tmp_path / 'messy.vtt'
+    src.write_text(MESSY_VTT, encoding='utf-8')
+    out = tmp_path / 'messy.stj.json'
+
+    count, issues = vtt_to_stj(str(src), str(out))
+    assert count == 3
+    assert any("'size'" in str(i) for i in issues)
+
+    stj = StandardTranscriptionJSON.from_file(str(out), validate=True)
+    first, second, third = stj.transcript.segments
+    assert first.text == "We are in New York City & more"
+    assert first.speaker_id == "Roger_Bingham"
+    assert second.text == "Plain bold text"
+    assert first.style_id == third.style_id
+    assert stj.transcript.styles[0].display == {
+        "align": "left", "vertical": "bottom", "position": {"x": "10%", "y": "90%"},
+    }
+
+
+def test_speaker_prefixes_are_opt_in(tmp_path):
+    src = tmp_path / 'notes.srt'
+    src.write_text("1\n00:00:01,000 --> 00:00:02,000\nNote: this is not a speaker\n",
+                   encoding='utf-8')
+    out = tmp_path / 'notes.stj.json'
+    assert import_srt(str(src), str(out))[0] == 1
+    stj = StandardTranscriptionJSON.from_file(str(out), validate=True)
+    assert stj.transcript.segments[0].text == "Note: this is not a speaker"
+    assert not stj.transcript.speakers
+
+
+def test_round_trip_through_srt(tmp_path):
+    srt_path = tmp_path / 'complex.srt'
+    subprocess.run(
+        ['python', os.path.join(TOOLS_DIR, 'stj_to_srt.py'),
+         os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json'), str(srt_path)],
+        check=True, capture_output=True,
+    )
+    out = tmp_path / 'complex.stj.json'
+    result = subprocess.run(
+        ['python', os.path.join(TOOLS_DIR, 'srt_to_stj.py'), str(srt_path), str(out),
+         '--speakers'],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout
+    original = StandardTranscriptionJSON.from_file(
+        os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+    )
+    imported = StandardTranscriptionJSON.from_file(str(out), validate=True)
+    assert [(s.start, s.end, s.speaker_id, s.text) for s in imported.transcript.segments] == [
+        (s.start, s.end, s.speaker_id, s.text) for s in original.transcript.segments
+    ]
@@ -0,0 +1,87 @@
+"""Tests for stjlib.tables and the stj-export tool."""
+
+import csv
+import gzip
+import math
+import os
+import subprocess
+
+import pytest
+from stjlib import StandardTranscriptionJSON, TimeMode
+from stjlib.tables import SEGMENT_COLUMNS, WORD_COLUMNS, iter_rows, write_csv
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+LATEST = os.path.join(PROJECT_ROOT, 'examples', 'latest')
+COMPLEX = os.path.join(LATEST, 'complex.stj.json')
+
+
+def _read(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_export_of_a_corpus(tmp_path):
+    corpus = os.path.join(LATEST, '*.stj.json')
+    segments_path = str(tmp_path / 'segments.csv')
+    words_path = str(tmp_path / 'words.csv.gz')
+    counts = write_csv(corpus, segments_path, words_path, block_size=2)
+
+    segments, words = _read(segments_path), _read(words_path)
+    assert counts == (len(segments), len(words))
+    assert list(segments[0]) == list(SEGMENT_COLUMNS)
+    assert list(words[0]) == list(WORD_COLUMNS)
+    assert {row['document'] for row in segments} == {'0', '1', '2'}
+
+    stj = StandardTranscriptionJSON.from_file(COMPLEX)
+    first = stj.transcript.segments[0]
+    assert segments[0]['text'] == first.text and float(segments[0]['end']) == first.end
+    assert int(segments[0]['word_count']) == len(first.words)
+    # Each word refers to the row of its segment
+    for word in words:
+        segment = segments[int(word['segment'])]
+        assert word['document'] == segment['document']
+        assert float(segment['start']) <= float(word['start']) <= float(segment['end'])
+    assert segments[1]['language'] and not any(row['style_id'] == 'None' for row in segments)
+
+    with pytest.raises(ValueError):
+        write_csv(corpus, segments_path, block_size=0)
+
+
+def test_rows_of_loaded_documents():
+    seconds = StandardTranscriptionJSON.from_file(COMPLEX)
+    exact = StandardTranscriptionJSON.from_file(COMPLEX, time_mode=TimeMode.MILLISECONDS)
+    rows = list(iter_rows([seconds, exact], missing=math.nan))
+    half = len(rows) // 2
+    assert [r[0][1:] for r in rows[:half]] == [r[0][1:] for r in rows[half:]]
+    assert type(rows[half][0][2]) is float
+    assert rows[half][1][0][:2] == (1, half)
+
+
+def test_numpy_arrays_match_csv_rows():
+    numpy = pytest.importorskip('numpy')
+    stj = StandardTranscriptionJSON.from_file(COMPLEX)
+    segments, words = stj.to_numpy()
+    rows = list(iter_rows(stj))
+    assert len(segments) == len(rows)
+    assert len(words) == sum(len(r[1]) for r in rows)
+    assert segments.dtype.names == SEGMENT_COLUMNS
+    assert list(segments['text']) == [s.text for s in stj.transcript.segments]
+    assert numpy.all(segments['start'][words['segment']] <= words['start'])
+
+    from stjlib.tables import to_numpy
+    blocked = to_numpy([COMPLEX, COMPLEX], block_size=3)
+    assert len(blocked.segments) == 2 * len(segments)
+    assert blocked.words['segment'][-1] == len(segments)
+    assert numpy.isnan(blocked.segments['confidence']).sum() == 2 * numpy.isnan(
+        segments['confidence']).sum()
+
+
+def test_cli_exports_every_input(tmp_path):
+    result = subprocess.run(
+        ['python', 'tools/python/stj_export.py', LATEST, '-s', str(tmp_path / 's.csv'),
+         '-w', str(tmp_path / 'w.csv'), '--list'],
+        capture_output=True, text=True, cwd=PROJECT_ROOT)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert 'from 3 files' in result.stdout
+    assert result.stdout.startswith('0\t')
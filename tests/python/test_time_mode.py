@@ -0,0 +1,117 @@
+"""Tests for loading documents with exact integer-millisecond times."""
+
+import copy
+import json
+import math
+import os
+import pickle
+
+import pytest
+from stjlib import Milliseconds, Segment, StandardTranscriptionJSON, TimeMode, Word
+from stjlib.alignment import realign_segment
+from stjlib.chunks import split_transcript
+from stjlib.core.timing import InexactMilliseconds, parse_time, to_milliseconds, to_seconds
+from stjlib.streaming import iter_segments
+from stjlib.validation.validators import validate_time_format
+
+from stj_to_ass import write_ass
+from stj_to_srt import write_srt
+from stj_to_ttml import write_ttml
+from stj_to_vtt import write_vtt
+from stj_writers import seconds_to_ms
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'latest', 'complex.stj.json')
+
+
+def test_parse_time_returns_milliseconds_or_keeps_the_value():
+    assert parse_time(12.345) == 12345 and isinstance(parse_time(12.345), Milliseconds)
+    assert parse_time(0.1) == 100
+    assert parse_time(999999.999) == 999999999
+    assert parse_time(7) == 7000
+    for value in (math.inf, True, "1.5", None):
+        assert parse_time(value) is value
+    assert math.isnan(parse_time(math.nan))
+
+    inexact = parse_time(1.9999)
+    assert isinstance(inexact, InexactMilliseconds) and inexact == 2000
+    assert to_seconds(inexact) == 1.9999 and str(inexact) == '1.9999'
+    assert copy.deepcopy(inexact) is inexact
+    assert pickle.loads(pickle.dumps(inexact)).seconds == 1.9999
+
+    time = Milliseconds(1500)
+    assert str(time) == '1.5' and f"{time}" == '1.5' and f"{time:.2f}" == '1.50'
+    assert to_seconds(time) == 1.5 and to_milliseconds(time) == 1500
+    assert copy.deepcopy(time) is time
+    assert seconds_to_ms(Milliseconds(10290)) == seconds_to_ms(10.29) == 10290
+
+
+def test_round_trip_and_validation_match_seconds_mode():
+    seconds = StandardTranscriptionJSON.from_file(COMPLEX, validate=True)
+    exact = StandardTranscriptionJSON.from_file(COMPLEX, validate=True,
+                                                time_mode=TimeMode.MILLISECONDS)
+    segment = exact.transcript.segments[0]
+    assert isinstance(segment.start, Milliseconds)
+    assert isinstance(segment.words[0].end, Milliseconds)
+    assert json.dumps(exact.to_dict()) == json.dumps(seconds.to_dict())
+    streamed = list(iter_segments(COMPLEX, time_mode=TimeMode.MILLISECONDS))
+    assert streamed == exact.transcript.segments
+
+    with pytest.raises(ValueError):
+        StandardTranscriptionJSON.from_file(COMPLEX, time_mode='minutes')
+
+
+def test_validation_of_millisecond_times():
+    assert validate_time_format(Milliseconds(999999999), 'x') == []
+    issues = validate_time_format(Milliseconds(1000000000), 'x')
+    assert 'exceeds maximum' in issues[0].message
+    assert 'non-negative, got -0.5' in validate_time_format(Milliseconds(-500), 'x')[0].message
+
+    data = {'stj': {'version': '0.6.0', 'transcript': {'segments': [
+        {'text': 'a', 'start': 1.0, 'end': 2.0001},
+        {'text': 'b', 'start': 2.5, 'end': 3.0},
+        {'text': 'c', 'start': 2.9, 'end': 4.0},
+    ]}}}
+    expected = StandardTranscriptionJSON.from_dict(data).validate(raise_exception=False)
+    issues = StandardTranscriptionJSON.from_dict(
+        data, time_mode='milliseconds').validate(raise_exception=False)
+    assert [i.message for i in issues] == [i.message for i in expected]
+    assert any('decimal places' in i.message for i in issues)
+    assert any('must not overlap' in i.message for i in issues)
+
+
+def test_inexact_times_compare_as_milliseconds():
+    data = {'stj': {'version': '0.6.0', 'transcript': {'segments': [
+        {'text': 'a b', 'start': 1.0, 'end': 2.0, 'words': [
+            {'text': 'a', 'start': 1.0, 'end': 1.5},
+            {'text': 'b', 'start': 1.5, 'end': 1.9999},
+        ]},
+    ]}}}
+    seconds = StandardTranscriptionJSON.from_dict(data)
+    exact = StandardTranscriptionJSON.from_dict(data, time_mode=TimeMode.MILLISECONDS)
+    issues = exact.validate(raise_exception=False)
+    expected = seconds.validate(raise_exception=False)
+    assert [i.message for i in issues] == [i.message for i in expected]
+    assert issues and all('decimal places' in i.message for i in issues)
+    assert json.dumps(exact.to_dict()) == json.dumps(seconds.to_dict())
+
+
+def test_tools_produce_the_same_output(tmp_path):
+    seconds = StandardTranscriptionJSON.from_file(COMPLEX)
+    exact = StandardTranscriptionJSON.from_file(COMPLEX, time_mode=TimeMode.MILLISECONDS)
+    for write, ext in ((write_srt, 'srt'), (write_vtt, 'vtt'), (write_ass, 'ass'),
+                       (write_ttml, 'ttml')):
+        write(seconds, str(tmp_path / f'seconds.{ext}'))
+        write(exact, str(tmp_path / f'exact.{ext}'))
+        assert (tmp_path / f'seconds.{ext}').read_text() == (tmp_path / f'exact.{ext}').read_text()
+
+    segment = Segment(text='one two three', start=Milliseconds(1000), end=Milliseconds(2000),
+                      words=[Word(text='one', start=Milliseconds(1000), end=Milliseconds(1400)),
+                             Word(text='three', start=Milliseconds(1600), end=Milliseconds(2000))])
+    assert realign_segment(segment)
+    assert all(isinstance(w.start, Milliseconds) for w in segment.words)
+
+    paths = split_transcript(exact, str(tmp_path / 'shards'), by='segments', size=1)
+    shard = StandardTranscriptionJSON.from_file(paths[1])
+    assert shard.metadata.extensions['shard']['offset'] == to_seconds(
+        exact.transcript.segments[1].start)
@@ -0,0 +1,149 @@
+"""Tests for the persistent validation cache in stjlib.validation.cache."""
+
+import json
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from stjlib import StandardTranscriptionJSON, STJError, ValidationCache, ValidationStats, __version__
+from stjlib.validation import cache as cache_module
+from stjlib.validation import ValidationSeverity
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+
+
+def _invalid_copy(tmp_path, name='invalid.stj.json'):
+    with open(COMPLEX, encoding='utf-8') as f:
+        data = json.load(f)
+    data['stj']['transcript']['segments'][0]['speaker_id'] = 'missing'
+    path = tmp_path / name
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+
+def test_from_file_reuses_cached_issues(tmp_path):
+    cache = ValidationCache(str(tmp_path / 'cache.sqlite3'))
+    invalid = _invalid_copy(tmp_path)
+
+    first = StandardTranscriptionJSON.from_file(invalid, validate=True,
+                                                raise_exception=False, cache=cache)
+    issues = first.validate(raise_exception=False)
+    assert issues and len(cache) == 1
+
+    stats = ValidationStats()
+    StandardTranscriptionJSON.from_file(invalid, validate=True, raise_exception=False,
+                                        cache=cache, stats=stats)
+    # A hit skips the validators entirely
+    assert stats.rules == {} and 'validate' in stats.phases
+    assert cache.validate_file(invalid) == issues
+    assert all(isinstance(i.severity, ValidationSeverity) for i in cache.validate_file(invalid))
+
+    with pytest.raises(STJError):
+        StandardTranscriptionJSON.from_file(invalid, validate=True, cache=cache)
+
+    StandardTranscriptionJSON.from_file(COMPLEX, validate=True, cache=cache)
+    assert len(cache) == 2
+
+
+def test_key_includes_content_profile_and_validator(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = ValidationCache(path)
+    with open(COMPLEX, 'rb') as f:
+        data = f.read()
+    cache.store(data, [])
+    assert cache.lookup(data) == []
+    assert cache.lookup(data + b'\n') is None
+    assert ValidationCache(path, profile='strict').lookup(data) is None
+
+    fingerprint = cache_module.validator_fingerprint()
+    assert fingerprint.startswith(f'{__version__}/{cache_module.CACHE_FORMAT}/')
+    # Results of a changed validator are not reused, even under the same version
+    monkeypatch.setattr(cache_module, 'validator_fingerprint', lambda: fingerprint + 'x')
+    assert cache.lookup(data) is None
+    monkeypatch.undo()
+    assert cache.lookup(data) == []
+    cache.clear()
+    assert cache.lookup(data) is None
+
+
+def test_least_recently_used_results_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, '_USED_RESOLUTION', 0)
+    cache = ValidationCache(str(tmp_path / 'cache.sqlite3'), max_bytes=1000)
+    documents = [b'doc-%d' % i for i in range(3)]
+    for document in documents:
+        cache.store(document, [])
+    # Touch the oldest result so that the second one is evicted first
+    cache.lookup(documents[0])
+    cache.max_bytes = 2 * 128 + 10
+    cache.store(b'doc-3', [])
+    assert cache.lookup(documents[1]) is None
+    assert cache.lookup(documents[2]) is None
+    assert cache.lookup(documents[0]) == []
+    assert len(cache) == 2
+
+
+def _stored_sizes(cache):
+    connection = cache._connection()
+    (total,) = connection.execute('SELECT size FROM totals').fetchone()
+    (summed,) = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()
+    return total, summed
+
+
+def test_hits_do_not_write_and_the_total_stays_exact(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = ValidationCache(path, max_bytes=3 * 128 + 50)
+    cache.store(b'doc-0', [])
+    connection = cache._connection()
+    changes = connection.total_changes
+    assert cache.lookup(b'doc-0') == []
+    # A recently used result is not touched again on a hit
+    assert connection.total_changes == changes
+    monkeypatch.setattr(cache_module, '_USED_RESOLUTION', 0)
+    cache.lookup(b'doc-0')
+    assert connection.total_changes == changes + 1
+
+    issues = ValidationCache(path).validate_file(_invalid_copy(tmp_path))
+    cache.store(b'doc-0', issues)  # Replaced with a larger result
+    for i in range(1, 5):
+        cache.store(b'doc-%d' % i, [])
+    total, summed = _stored_sizes(cache)
+    assert total == summed and 0 < total <= cache.max_bytes
+    cache.clear()
+    assert _stored_sizes(cache) == (0, 0)
+
+
+def test_total_is_seeded_for_databases_without_it(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = ValidationCache(path)
+    cache.store(b'doc', [])
+    cache.store(b'other', [])
+    connection = cache._connection()
+    connection.execute('DROP TABLE totals')
+    cache.close()
+    assert _stored_sizes(ValidationCache(path)) == (2 * (128 + len('[]')),) * 2
+
+
+def _validate_in_worker(cache, path):
+    return [issue.to_dict() for issue in cache.validate_file(path)]
+
+
+def test_shared_between_worker_processes(tmp_path):
+    cache = ValidationCache(str(tmp_path / 'cache.sqlite3'))
+    paths = [_invalid_copy(tmp_path, f'{i % 3}.stj.json') for i in range(12)]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_validate_in_worker, [cache] * len(paths), paths))
+    assert all(result == results[0] and result for result in results)
+    assert len(cache) == 1
+
+
+def test_cli_cache(tmp_path):
+    invalid = _invalid_copy(tmp_path)
+    command = ['python', 'tools/python/stj_validator.py', invalid,
+               '--cache', str(tmp_path / 'cache.sqlite3')]
+    runs = [subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_ROOT)
+            for _ in range(2)]
+    assert [run.returncode for run in runs] == [1, 1]
+    assert runs[0].stdout == runs[1].stdout
+    assert 'missing' in runs[0].stdout
@@ -0,0 +1,67 @@
+"""Tests for validation instrumentation with stjlib.ValidationStats."""
+
+import os
+
+from stjlib import StandardTranscriptionJSON, ValidationStats
+from stjlib.validation import validate_stj
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+COMPLEX = os.path.join(PROJECT_ROOT, 'examples', 'v0.6.0', 'complex.stj.json')
+
+RULE_GROUPS = [
+    'root_structure', 'types', 'references', 'version', 'metadata', 'transcript',
+    'transcript.speakers', 'transcript.segments', 'transcript.styles',
+    'language_codes', 'language_consistency', 'confidence_scores', 'extensions',
+]
+
+
+def test_from_file_records_phases_and_rule_groups():
+    stats = ValidationStats()
+    stj = StandardTranscriptionJSON.from_file(
+        COMPLEX, validate=True, raise_exception=False, stats=stats
+    )
+
+    assert list(stats.phases) == ['read', 'parse', 'build', 'validate']
+    assert all(seconds >= 0 for seconds in stats.phases.values())
+    assert sorted(stats.rules) == sorted(RULE_GROUPS)
+
+    segments = stj.transcript.segments
+    words = sum(len(s.words or []) for s in segments)
+    assert stats.rules['transcript.segments'].nodes == len(segments) + words
+    assert stats.rules['transcript.speakers'].nodes == len(stj.transcript.speakers)
+    assert all(rule.calls == 1 for rule in stats.rules.values())
+    # The transcript group contains its nested groups
+    nested = sum(stats.rules[name].seconds for name in RULE_GROUPS if name.startswith('transcript.'))
+    assert stats.rules['transcript'].seconds >= nested
+
+
+def test_issue_counts_match_returned_issues():
+    stj = StandardTranscriptionJSON.from_file(COMPLEX)
+    stj.transcript.segments[0].speaker_id = 'missing'
+    stj.transcript.segments[1].language = 'zz-invalid'
+
+    stats = ValidationStats()
+    issues = validate_stj(stj.stj, stats=stats)
+
+    top_level = [name for name in stats.rules if '.' not in name]
+    assert sum(stats.rules[name].issues for name in top_level) == len(issues)
+    assert stats.rules['references'].issues >= 1
+    assert validate_stj(stj.stj) == issues
+
+
+def test_callback_receives_every_measurement_and_stats_accumulate():
+    events = []
+    stats = ValidationStats(callback=events.append)
+    stj = StandardTranscriptionJSON.from_file(COMPLEX, stats=stats)
+    stj.validate(stats=stats)
+    stj.validate(stats=stats)
+
+    assert [e.name for e in events if e.kind == 'phase'] == ['read', 'parse', 'build']
+    assert len([e for e in events if e.kind == 'rule']) == 2 * len(RULE_GROUPS)
+    assert stats.rules['types'].calls == 2
+    assert stats.slowest(1)[0][1].seconds == max(r.seconds for r in stats.rules.values())
+
+    data = stats.to_dict()
+    assert set(data) == {'rules', 'phases'}
+    stats.reset()
+    assert stats.rules == {} and stats.phases == {}
@@ -1,7 +1,7 @@
 import json
 import os
 import pytest
-from stjlib import StandardTranscriptionJSON
+from stjlib import StandardTranscriptionJSON, WordTimingMode
 from stjlib.stj import ValidationError
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -82,3 +82,96 @@ def test_schema_error():
     }
     validation_issues = StandardTranscriptionJSON.from_dict(stj_data).validate(raise_exception=False)
     assert validation_issues  # Should have validation issues
+
+def test_repeated_strings_are_shared_after_loading():
+    # Separate string objects, as json.loads returns them for values
+    segments = [
+        {"text": "yes", "start": float(i), "end": i + 0.5, "speaker_id": "".join(["S", "1"]),
+         "language": "".join(["e", "n"]), "word_timing_mode": "complete",
+         "words": [{"text": "".join(["ye", "s"]), "start": float(i), "end": i + 0.5,
+                    "extensions": {"".join(["as", "r"]): {"model": "a"}}}]}
+        for i in range(3)
+    ]
+    stj_data = {"stj": {"version": "0.6.0", "transcript": {
+        "speakers": [{"id": "S1"}], "segments": segments}}}
+    transcript = StandardTranscriptionJSON.from_dict(stj_data).transcript
+
+    first, *rest = transcript.segments
+    assert first.speaker_id is transcript.speakers[0].id
+    assert all(s.speaker_id is first.speaker_id and s.language is first.language for s in rest)
+    namespace = next(iter(first.words[0].extensions))
+    assert all(next(iter(s.words[0].extensions)) is namespace for s in rest)
+    assert rest[0].words[0].extensions == {"asr": {"model": "a"}}
+    # Word texts are not pooled, so the pool does not grow with the vocabulary
+    assert rest[0].words[0].text is not first.words[0].text
+    assert first.word_timing_mode is WordTimingMode.COMPLETE
+
+    stj_data["stj"]["transcript"]["segments"][0]["word_timing_mode"] = "sometimes"
+    with pytest.raises(ValueError):
+        StandardTranscriptionJSON.from_dict(stj_data)
+
+def test_extension_budgets_and_shared_subtrees(monkeypatch):
+    from stjlib.validation.validators import validate_all_extensions, validate_extensions
+
+    # Deeper than the interpreter could recurse
+    tree = {}
+    for level in range(5000):
+        tree = {f"level-{level}": {"extensions": tree}}
+    assert validate_extensions(tree, "x", max_depth=5000) == []
+    issues = validate_extensions(tree, "x", max_depth=2)
+    assert len(issues) == 1 and "more than 2 levels deep" in issues[0].message
+    assert issues[0].location == "x.level-4999.extensions.level-4998.extensions.level-4997.extensions"
+
+    wide = {f"ns-{i}": {} for i in range(10)}
+    assert "more than 5 namespaces" in validate_extensions(wide, "x", max_nodes=5)[0].message
+    assert "maximum size" in validate_extensions(wide, "x", max_bytes=10)[0].message
+    assert validate_extensions(wide, "x", max_nodes=10, max_bytes=1000) == []
+
+    # Sizes are bytes of UTF-8 JSON
+    accented = {"caf\u00e9": {}}
+    assert validate_extensions(accented, "x", max_bytes=len('{"caf\u00e9": {}}') + 1) == []
+    assert validate_extensions(accented, "x", max_bytes=len('{"caf\u00e9": {}}'))
+
+    # Too deep to measure is reported, not let through
+    issues = validate_extensions(tree, "x", max_depth=5000, max_bytes=10 ** 9)
+    assert len(issues) == 1 and "too deeply nested or circular" in issues[0].message
+
+    # A payload shared by every segment is walked once, but its issues are
+    # reported at each location
+    from stjlib.validation import validators
+    from stjlib.validation.validators import validate_stj
+
+    walks = []
+
+    def counting_check(*args):
+        walks.append(args[0])
+        return check_extensions(*args)
+
+    check_extensions = validators._check_extensions
+    monkeypatch.setattr(validators, '_check_extensions', counting_check)
+    shared = {"vendor": {"extensions": {"stj": {}, "a": {"extensions": {"a": {}}}}}}
+    segments = [{"text": "a", "start": float(i), "end": i + 0.5, "extensions": shared}
+                for i in range(3)]
+    stj = StandardTranscriptionJSON.from_dict(
+        {"stj": {"version": "0.6.0", "transcript": {"segments": segments}}})
+    issues = [i for i in validate_stj(stj.stj) if i.spec_ref.startswith("#extensions")]
+    assert walks == [shared]
+    assert issues == validate_all_extensions(stj)
+    assert [(i.location, i.spec_ref) for i in issues[:2]] == [
+        ("transcript.segments[0].extensions.vendor.extensions.stj", "#extensions-reserved"),
+        ("transcript.segments[0].extensions.vendor.extensions.a.extensions.a",
+         "#extensions-circular"),
+    ]
+    assert issues[1].message.endswith("vendor -> a -> a")
+    assert len(issues) == 6 and issues[5].location.startswith("transcript.segments[2].")
+
+
+def test_extension_budgets_reach_validation_from_file(tmp_path):
+    path = tmp_path / 'wide.stj.json'
+    path.write_text(json.dumps({"stj": {"version": "0.6.0", "transcript": {"segments": [
+        {"text": "a", "start": 0.0, "end": 1.0, "extensions": {"vendor": {"x": "y" * 100}}}]}}}))
+    StandardTranscriptionJSON.from_file(str(path), validate=True)
+    with pytest.raises(Exception, match="maximum size of 50 bytes"):
+        StandardTranscriptionJSON.from_file(str(path), validate=True, max_bytes=50)
+    stj = StandardTranscriptionJSON.from_file(str(path))
+    assert stj.validate(raise_exception=False, max_nodes=0)
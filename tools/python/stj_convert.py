@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""stj-convert: convert many STJ files to several subtitle formats at once.
+
+Each input is parsed and validated once and every requested format is
+written from that single in-memory document.  Files are spread across a
+pool of worker processes.  With ``--watch`` the inputs are converted again
+whenever they change (see ``stj_watch``).
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib import StandardTranscriptionJSON, TimeMode  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib import StandardTranscriptionJSON, TimeMode  # noqa: E402
+
+from stjlib.compression import (  # noqa: E402
+    COMPRESSED_SUFFIXES,
+    COMPRESSIONS,
+    strip_compression_suffix,
+)
+
+from stj_inputs import expand_inputs  # noqa: E402
+from stj_resegment import add_resegment_arguments, limits_from_args  # noqa: E402
+from stj_to_ass import write_ass  # noqa: E402
+from stj_to_srt import write_srt  # noqa: E402
+from stj_to_ttml import write_ttml  # noqa: E402
+from stj_to_vtt import write_vtt  # noqa: E402
+from stj_watch import add_watch_arguments, watch  # noqa: E402
+
+WRITERS = {
+    'srt': write_srt,
+    'vtt': write_vtt,
+    'ass': write_ass,
+    'ttml': write_ttml,
+}
+
+DEFAULT_FORMATS = ['srt', 'vtt', 'ass']
+
+KARAOKE_FORMATS = ('vtt', 'ass')
+
+STJ_SUFFIXES = ('.stj.json', '.json')
+
+# Codec -> output file extension
+COMPRESSION_SUFFIXES = {codec: suffix for suffix, codec in COMPRESSED_SUFFIXES.items()}
+
+
+def output_path(stj_file, fmt, output_dir=None, compression=None):
+    """Return the output path for ``stj_file`` converted to ``fmt``.
+
+    With ``compression`` the codec's extension is appended, which makes the
+    writers compress the output.
+    """
+    directory, name = os.path.split(strip_compression_suffix(stj_file))
+    for suffix in STJ_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    suffix = COMPRESSION_SUFFIXES[compression] if compression else ''
+    return os.path.join(output_dir if output_dir else directory, f"{name}.{fmt}{suffix}")
+
+
+def duplicate_outputs(files, output_dir):
+    """Return the groups of ``files`` that would be written to the same outputs.
+
+    Under ``output_dir``, files of the same name from different directories
+    collide; anywhere, so do a file and its compressed copy.
+
+    Returns:
+        list: Lists of two or more files sharing an output name, in input order
+    """
+    by_target = {}
+    for stj_file in files:
+        target = os.path.normcase(os.path.abspath(output_path(stj_file, '', output_dir)))
+        by_target.setdefault(target, []).append(stj_file)
+    return [group for group in by_target.values() if len(group) > 1]
+
+
+def _check_duplicates(files, output_dir):
+    duplicates = duplicate_outputs(files, output_dir)
+    for group in duplicates:
+        print(f"Error: {', '.join(group)} would be written to the same output files")
+    if duplicates:
+        sys.exit(1)
+
+
+def convert_file(stj_file, formats, output_dir=None, limits=None, karaoke=False,
+                 compression=None):
+    """Parse and validate one file and write every requested format.
+
+    ``limits`` re-segments cues for every format; ``karaoke`` adds per-word
+    timing to the formats in ``KARAOKE_FORMATS``; ``compression`` compresses
+    every output with that codec.  Compressed inputs are read transparently.
+
+    Returns:
+        tuple: (stj_file, list of written paths, elapsed seconds, error message or None)
+    """
+    started = time.perf_counter()
+    written = []
+    try:
+        stj = StandardTranscriptionJSON.from_file(stj_file, validate=True,
+                                                  time_mode=TimeMode.MILLISECONDS)
+        for fmt in formats:
+            target = output_path(stj_file, fmt, output_dir, compression)
+            if karaoke and fmt in KARAOKE_FORMATS:
+                WRITERS[fmt](stj, target, limits, karaoke=True)
+            else:
+                WRITERS[fmt](stj, target, limits)
+            written.append(target)
+    except Exception as e:
+        return stj_file, written, time.perf_counter() - started, str(e)
+    return stj_file, written, time.perf_counter() - started, None
+
+
+def convert_all(files, formats, output_dir=None, jobs=None, limits=None, karaoke=False,
+                compression=None):
+    """Convert ``files`` to ``formats``, yielding results as files complete.
+
+    With ``jobs`` of 1 (or a single file) everything runs in this process;
+    otherwise files are distributed over a process pool.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) <= 1:
+        for stj_file in files:
+            yield convert_file(stj_file, formats, output_dir, limits, karaoke, compression)
+        return
+
+    # Only multi-file runs pay for importing the process pool machinery
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+        futures = [pool.submit(convert_file, f, formats, output_dir, limits, karaoke,
+                               compression)
+                   for f in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _parse_formats(value):
+    formats = []
+    for fmt in value.split(','):
+        fmt = fmt.strip().lower()
+        if fmt not in WRITERS:
+            raise argparse.ArgumentTypeError(
+                f"unknown format '{fmt}' (choose from {', '.join(WRITERS)})"
+            )
+        if fmt not in formats:
+            formats.append(fmt)
+    return formats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='stj-convert',
+        description="Convert STJ files to several subtitle formats in one pass.",
+    )
+    parser.add_argument('inputs', nargs='+', help="STJ files, directories or glob patterns")
+    parser.add_argument('-f', '--formats', type=_parse_formats, default=DEFAULT_FORMATS,
+                        help="Comma-separated output formats: srt, vtt, ass, ttml "
+                             "(default: srt,vtt,ass)")
+    parser.add_argument('-o', '--output-dir',
+                        help="Directory for output files (default: next to each input)")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Only print the summary and failures")
+    parser.add_argument('--compress', choices=COMPRESSIONS,
+                        help="Compress every output file with this codec")
+    add_resegment_arguments(parser, karaoke=True)
+    add_watch_arguments(parser)
+    args = parser.parse_args()
+    limits = limits_from_args(args, parser)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    if args.watch:
+        _check_duplicates(expand_inputs(args.inputs), args.output_dir)
+
+        def report(result):
+            stj_file, written, elapsed, error = result
+            stamp = time.strftime('%H:%M:%S')
+            if error:
+                print(f"[{stamp}] FAILED {stj_file}: {error}", flush=True)
+            elif not args.quiet:
+                print(f"[{stamp}] {stj_file} -> {', '.join(written)} ({elapsed:.3f}s)",
+                      flush=True)
+
+        watch(args.inputs, convert_file,
+              (args.formats, args.output_dir, limits, args.karaoke, args.compress), report,
+              jobs=args.jobs, interval=args.interval, debounce=args.debounce,
+              use_inotify=not args.poll)
+        sys.exit(0)
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("No STJ files found.")
+        sys.exit(1)
+    _check_duplicates(files, args.output_dir)
+
+    started = time.perf_counter()
+    failures = 0
+    outputs = 0
+    for done, (stj_file, written, elapsed, error) in enumerate(
+        convert_all(files, args.formats, args.output_dir, args.jobs, limits, args.karaoke,
+                    args.compress),
+        start=1
+    ):
+        outputs += len(written)
+        if error:
+            failures += 1
+            print(f"[{done}/{len(files)}] FAILED {stj_file}: {error}")
+        elif not args.quiet:
+            print(f"[{done}/{len(files)}] {stj_file} -> {', '.join(written)} ({elapsed:.3f}s)")
+
+    total = time.perf_counter() - started
+    print(f"Converted {len(files) - failures}/{len(files)} files "
+          f"({outputs} outputs) in {total:.2f}s")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
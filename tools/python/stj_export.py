@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""stj-export: export the segments and words of STJ files as CSV tables.
+
+Every input is streamed through ``stjlib.tables.write_csv`` one segment at a
+time, so a corpus of any size is flattened in a single pass and in bounded
+memory.  One segment table and, optionally, one word table are written for
+the whole corpus; the ``document`` column gives the position of each row's
+file in the list printed with ``--list``.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib.tables import DEFAULT_BLOCK_SIZE, write_csv  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib.tables import DEFAULT_BLOCK_SIZE, write_csv  # noqa: E402
+
+from stj_inputs import expand_inputs  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='stj-export',
+        description="Export the segments and words of STJ files as CSV tables.",
+    )
+    parser.add_argument('inputs', nargs='+', help="STJ files, directories or glob patterns")
+    parser.add_argument('-s', '--segments', required=True,
+                        help="Output path of the segment table (.csv, optionally .gz/.xz/.bz2)")
+    parser.add_argument('-w', '--words', help="Output path of the word table")
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help=f"Rows written at a time (default: {DEFAULT_BLOCK_SIZE})")
+    parser.add_argument('--list', action='store_true',
+                        help="Print each input with its document number")
+    args = parser.parse_args()
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("No STJ files found.")
+        sys.exit(1)
+    if args.list:
+        for document, stj_file in enumerate(files):
+            print(f"{document}\t{stj_file}")
+
+    started = time.perf_counter()
+    try:
+        segments, words = write_csv(files, args.segments, args.words, args.block_size)
+    except Exception as e:
+        print(f"FAILED: {e}")
+        sys.exit(1)
+    tables = f"{segments} segments" + (f" and {words} words" if args.words else "")
+    print(f"Exported {tables} from {len(files)} files "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""stj-generate: write deterministic synthetic STJ documents of any size.
+
+Documents are generated from a seed, segment by segment, and streamed to disk
+with ``stjlib.streaming.STJWriter``, so a corpus with millions of words never
+has to fit in memory.  Named shapes reproduce the pathological inputs seen in
+production (huge transcripts, deep extension trees, thousands of speakers,
+a language switch on every segment, dense overlaps and maximal-precision
+timestamps), and defects can be injected to produce documents the validator
+must reject.
+
+Note that the ``dense-overlaps`` shape is invalid STJ by construction, since
+segments must not overlap; it exists to exercise overlap handling.
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib.streaming import STJWriter  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib.streaming import STJWriter  # noqa: E402
+
+VOCABULARY = (
+    "the of and to in is that it was for on are as with his they at be this "
+    "from have or by one had not but what all were when we there can an your "
+    "which their said if do will each about how up out them then she many some "
+    "so these would other into has more her two like him see time could no make "
+    "than first been its who now people my made over did down only way find use "
+    "may water long little very after words called just where most know"
+).split()
+
+LANGUAGES = (
+    'en', 'fr', 'de', 'es', 'it', 'pt', 'nl', 'sv', 'pl', 'ru', 'ja', 'zh',
+    'ko', 'ar', 'he', 'hi', 'tr', 'el', 'fi', 'da', 'cs', 'hu', 'ro', 'uk',
+)
+
+# Keyword defaults of CorpusSpec for each named shape
+SHAPES = {
+    'basic': {},
+    'large': {'words': 2_000_000},
+    'deep-extensions': {'extension_depth': 200},
+    'many-speakers': {'speakers': 5000},
+    'language-switching': {'languages': len(LANGUAGES)},
+    'dense-overlaps': {'overlap': 0.5},
+    'max-precision': {'precision': True},
+}
+
+DEFECTS = (
+    'reversed-time',
+    'unknown-speaker',
+    'invalid-language',
+    'confidence-range',
+    'word-outside-segment',
+    'text-mismatch',
+    'reserved-extension',
+    'excess-precision',
+)
+
+WORD_MS = 400
+GAPS_MS = (200, 500, 1000)
+
+
+class CorpusSpec:
+    """Parameters of a synthetic document.
+
+    Args:
+        words: Total number of words
+        words_per_segment: Average words per segment
+        word_timing: Whether segments carry timed ``words``
+        speakers: Number of speakers, used in turn
+        languages: Number of languages; above 1 every segment switches
+        extension_depth: Depth of the extension tree attached to the
+            metadata and every segment (0 for none)
+        overlap: Fraction of each segment overlapped by the next one
+        precision: Use millisecond-granular, irregular timestamps
+        defects: Defect names from ``DEFECTS`` to inject
+        defect_rate: Fraction of segments that receive a defect
+        seed: Random seed; equal specs produce identical output
+    """
+
+    def __init__(self, words=10000, words_per_segment=12, word_timing=True, speakers=2,
+                 languages=1, extension_depth=0, overlap=0.0, precision=False,
+                 defects=(), defect_rate=0.01, seed=0):
+        if words < 1 or words_per_segment < 1 or speakers < 1:
+            raise ValueError("Word, segment and speaker counts must be positive")
+        if not 1 <= languages <= len(LANGUAGES):
+            raise ValueError(f"Languages must be between 1 and {len(LANGUAGES)}")
+        if extension_depth < 0:
+            raise ValueError("Extension depth cannot be negative")
+        if not 0 <= overlap < 1:
+            raise ValueError("Overlap must be at least 0 and below 1")
+        if not 0 < defect_rate <= 1:
+            raise ValueError("Defect rate must be above 0 and at most 1")
+        unknown = [d for d in defects if d not in DEFECTS]
+        if unknown:
+            raise ValueError(f"Unknown defects: {', '.join(unknown)}")
+        self.words = words
+        self.words_per_segment = words_per_segment
+        self.word_timing = word_timing
+        self.speakers = speakers
+        self.languages = languages
+        self.extension_depth = extension_depth
+        self.overlap = overlap
+        self.precision = precision
+        self.defects = tuple(defects)
+        self.defect_rate = defect_rate
+        self.seed = seed
+
+    @classmethod
+    def for_shapes(cls, shapes, **overrides):
+        """Build a spec from named shapes; explicit keyword values win."""
+        kwargs = {}
+        for shape in shapes:
+            if shape not in SHAPES:
+                raise ValueError(f"Unknown shape: {shape}")
+            kwargs.update(SHAPES[shape])
+        kwargs.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**kwargs)
+
+
+def speaker_ids(spec):
+    return ["S%d" % (i + 1) for i in range(spec.speakers)]
+
+
+def extension_tree(depth, label):
+    """Return nested extensions ``depth`` namespaces deep."""
+    tree = None
+    for level in reversed(range(depth)):
+        value = {'level': level, 'label': label}
+        if tree is not None:
+            value['extensions'] = tree
+        tree = {'level-%d' % level: value}
+    return tree
+
+
+def _ms(value):
+    return value / 1000
+
+
+def _inject(segment, defect, rng):
+    """Apply one defect to a segment dictionary in place."""
+    if defect == 'reversed-time':
+        segment['start'], segment['end'] = segment['end'], segment['start']
+    elif defect == 'unknown-speaker':
+        segment['speaker_id'] = 'undefined-speaker'
+    elif defect == 'invalid-language':
+        segment['language'] = 'zz-invalid'
+    elif defect == 'confidence-range':
+        target = segment['words'][0] if segment.get('words') else segment
+        target['confidence'] = round(1 + rng.random(), 2)
+    elif defect == 'word-outside-segment':
+        if segment.get('words'):
+            segment['words'][-1]['end'] = round(segment['end'] + 1, 3)
+        else:
+            segment['words'] = [{'text': segment['text'], 'start': segment['start'],
+                                 'end': round(segment['end'] + 1, 3)}]
+    elif defect == 'text-mismatch':
+        segment['text'] = 'mismatch ' + segment['text']
+    elif defect == 'reserved-extension':
+        segment['extensions'] = {'stj': {'reserved': True}}
+    elif defect == 'excess-precision':
+        segment['start'] = segment['start'] + 0.0001
+
+
+def generate_segments(spec):
+    """Yield the segment dictionaries of a document, in time order."""
+    rng = random.Random(spec.seed)
+    speakers = speaker_ids(spec)
+    extensions = extension_tree(spec.extension_depth, 'segment')
+    low = max(1, spec.words_per_segment // 2)
+    high = max(low, spec.words_per_segment * 3 // 2)
+
+    t = 1234 if spec.precision else 0
+    remaining = spec.words
+    index = 0
+    while remaining:
+        count = min(remaining, rng.randint(low, high))
+        remaining -= count
+        texts = [rng.choice(VOCABULARY) for _ in range(count)]
+        bounds = [t]
+        for _ in texts:
+            bounds.append(bounds[-1] + (rng.randint(101, 997) if spec.precision else WORD_MS))
+
+        segment = {
+            'start': _ms(bounds[0]),
+            'end': _ms(bounds[-1]),
+            'speaker_id': speakers[index % len(speakers)],
+            'text': ' '.join(texts),
+        }
+        if spec.languages > 1:
+            segment['language'] = LANGUAGES[index % spec.languages]
+        if spec.word_timing:
+            segment['words'] = [
+                {
+                    'start': _ms(bounds[i]),
+                    'end': _ms(bounds[i + 1]),
+                    'text': text,
+                    'confidence': round(rng.uniform(0.6, 1.0), 2),
+                }
+                for i, text in enumerate(texts)
+            ]
+        if extensions:
+            segment['extensions'] = extensions
+        if spec.defects and rng.random() < spec.defect_rate:
+            _inject(segment, rng.choice(spec.defects), rng)
+        yield segment
+
+        duration = bounds[-1] - bounds[0]
+        if spec.overlap:
+            t = bounds[-1] - max(1, int(duration * spec.overlap))
+        else:
+            t = bounds[-1] + (rng.randint(1, 999) if spec.precision else rng.choice(GAPS_MS))
+        index += 1
+
+
+def document_header(spec):
+    """Return the ``(metadata, speakers)`` of a document."""
+    metadata = {
+        'transcriber': {'name': 'stj-generate', 'version': '1.0'},
+        'created_at': '2024-01-01T00:00:00Z',
+        'languages': list(LANGUAGES[:spec.languages]),
+    }
+    extensions = extension_tree(spec.extension_depth, 'metadata')
+    if extensions:
+        metadata['extensions'] = extensions
+    speakers = [{'id': sid, 'name': 'Speaker %s' % sid} for sid in speaker_ids(spec)]
+    return metadata, speakers
+
+
+def write_corpus(spec, f, indent=None):
+    """Write the document described by ``spec`` to a path or text handle.
+
+    Returns the number of segments written.
+    """
+    metadata, speakers = document_header(spec)
+    with STJWriter(f, metadata=metadata, speakers=speakers, indent=indent) as writer:
+        writer.write_segments(generate_segments(spec))
+    return writer.segment_count
+
+
+def _parse_defects(value):
+    if value == 'all':
+        return DEFECTS
+    return tuple(d.strip() for d in value.split(',') if d.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='stj-generate',
+        description="Generate a deterministic synthetic STJ document.",
+    )
+    parser.add_argument('output', help="Path of the STJ file to write")
+    parser.add_argument('--shape', action='append', choices=list(SHAPES), default=[],
+                        help="Named shape; may be given several times (default: basic)")
+    parser.add_argument('--words', type=int, help="Total number of words")
+    parser.add_argument('--words-per-segment', type=int, help="Average words per segment")
+    parser.add_argument('--no-word-timing', dest='word_timing', action='store_false',
+                        default=None, help="Omit word-level timing")
+    parser.add_argument('--speakers', type=int, help="Number of speakers")
+    parser.add_argument('--languages', type=int,
+                        help=f"Number of languages, switched every segment (max {len(LANGUAGES)})")
+    parser.add_argument('--extension-depth', type=int, help="Depth of nested extension trees")
+    parser.add_argument('--overlap', type=float,
+                        help="Fraction of each segment overlapped by the next")
+    parser.add_argument('--precision', action='store_true', default=None,
+                        help="Use irregular millisecond timestamps")
+    parser.add_argument('--invalid', type=_parse_defects, metavar='DEFECTS',
+                        help="Inject defects: 'all' or a comma-separated list of "
+                        + ', '.join(DEFECTS))
+    parser.add_argument('--defect-rate', type=float,
+                        help="Fraction of segments receiving a defect (default: 0.01)")
+    parser.add_argument('--seed', type=int, help="Random seed (default: 0)")
+    parser.add_argument('--indent', type=int, help="JSON indentation (default: compact)")
+    args = parser.parse_args()
+
+    try:
+        spec = CorpusSpec.for_shapes(
+            args.shape or ['basic'],
+            words=args.words, words_per_segment=args.words_per_segment,
+            word_timing=args.word_timing, speakers=args.speakers, languages=args.languages,
+            extension_depth=args.extension_depth, overlap=args.overlap,
+            precision=args.precision, defects=args.invalid, defect_rate=args.defect_rate,
+            seed=args.seed,
+        )
+        count = write_corpus(spec, args.output, indent=args.indent)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Wrote {count} segments ({spec.words} words) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Input file discovery shared by the batch tools and watch mode.
+
+Kept apart from ``stj_convert`` so that tools which only need to find STJ
+files, such as ``stj-validator --watch``, do not import the subtitle writers.
+"""
+
+import glob
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib.compression import COMPRESSED_SUFFIXES  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib.compression import COMPRESSED_SUFFIXES  # noqa: E402
+
+# File names searched for in input directories
+STJ_PATTERNS = ['*.stj.json'] + ['*.stj.json' + suffix for suffix in COMPRESSED_SUFFIXES]
+
+
+def expand_inputs(inputs):
+    """Expand files, directories and glob patterns into a list of STJ files.
+
+    Directories are searched recursively for ``*.stj.json`` files, plain or
+    compressed.  Plain paths are kept even if missing so the conversion
+    reports them.
+    """
+    found = []
+    for item in inputs:
+        if os.path.isdir(item):
+            found.extend(sorted(
+                path for pattern in STJ_PATTERNS
+                for path in glob.glob(os.path.join(item, '**', pattern), recursive=True)
+            ))
+        elif glob.has_magic(item):
+            found.extend(sorted(p for p in glob.glob(item, recursive=True) if os.path.isfile(p)))
+        else:
+            found.append(item)
+    seen = set()
+    unique = []
+    for path in found:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""stj-migrate: upgrade STJ files from older specification versions.
+
+Each file is streamed through ``stjlib.migration.migrate_file``, one segment
+at a time, so archives of long transcripts are migrated without loading any
+of them whole.  Files are processed in parallel and written either to an
+output directory or back in place; ``--check`` only reports what would
+change.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib.migration import LATEST_VERSION, migrate_file  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib.migration import LATEST_VERSION, migrate_file  # noqa: E402
+
+from stj_inputs import expand_inputs  # noqa: E402
+
+
+def migrate_one(stj_file, output_dir=None, check=False):
+    """Migrate one file.
+
+    Returns:
+        tuple: (stj_file, MigrationReport or None, error or None)
+    """
+    try:
+        target = os.path.join(output_dir, os.path.basename(stj_file)) if output_dir else None
+        report = migrate_file(stj_file, target, dry_run=check)
+    except Exception as e:
+        return stj_file, None, str(e)
+    return stj_file, report, None
+
+
+def migrate_all(files, output_dir=None, check=False, jobs=None):
+    """Migrate ``files``, yielding results as files complete."""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) <= 1:
+        for stj_file in files:
+            yield migrate_one(stj_file, output_dir, check)
+        return
+
+    # Only multi-file runs pay for importing the process pool machinery
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+        futures = [pool.submit(migrate_one, f, output_dir, check) for f in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_report(stj_file, report):
+    """Return the lines describing one file's migration."""
+    if not report.changed:
+        return [f"{stj_file}: already at {report.target_version}"]
+    target = f" -> {report.output}" if report.output else ""
+    lines = [f"{stj_file}: {report.source_version} -> {report.target_version}, "
+             f"{report.segments} segments{target}"]
+    for change, count in sorted(report.changes.items()):
+        lines.append(f"    {count:>6} x {change}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='stj-migrate',
+        description=f"Upgrade STJ files to specification version {LATEST_VERSION}.",
+    )
+    parser.add_argument('inputs', nargs='+', help="STJ files, directories or glob patterns")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('-o', '--output-dir', help="Directory for the migrated files")
+    target.add_argument('--in-place', action='store_true',
+                        help="Rewrite files that need migrating in place")
+    target.add_argument('--check', action='store_true',
+                        help="Report the changes without writing; exit 1 if any file is outdated")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Only print the summary and failures")
+    args = parser.parse_args()
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("No STJ files found.")
+        sys.exit(1)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    failures = 0
+    outdated = 0
+    for stj_file, report, error in migrate_all(files, args.output_dir, args.check, args.jobs):
+        if error:
+            failures += 1
+            print(f"FAILED {stj_file}: {error}")
+            continue
+        outdated += report.changed
+        if not args.quiet and (report.changed or args.output_dir):
+            print("\n".join(format_report(stj_file, report)))
+
+    verb = "Would migrate" if args.check else "Migrated"
+    print(f"{verb} {outdated}/{len(files) - failures} files to {LATEST_VERSION} "
+          f"in {time.perf_counter() - started:.2f}s")
+    sys.exit(1 if failures or (args.check and outdated) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Command-line helpers shared by srt_to_stj.py and vtt_to_stj.py.
+
+The importers themselves live in ``stjlib.importers``; this module only
+makes stjlib importable from a source checkout and prints import results.
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib.importers import import_srt, import_vtt  # noqa: E402
+    from stjlib.validation import ValidationSeverity  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib.importers import import_srt, import_vtt  # noqa: E402
+    from stjlib.validation import ValidationSeverity  # noqa: E402
+
+__all__ = ['import_srt', 'import_vtt', 'add_import_arguments', 'report_import']
+
+
+def add_import_arguments(parser):
+    """Add the options shared by the subtitle importers to an argparse parser."""
+    parser.add_argument('--language', help="Language code of the subtitles (e.g. 'en')")
+    parser.add_argument('--speakers', action='store_true',
+                        help="Map 'Name: text' prefixes to speakers")
+
+
+def report_import(count, issues, output_path):
+    """Print an importer summary and return the process exit status."""
+    for i, issue in enumerate(issues, 1):
+        print(f"{i}. {issue.severity.value}: {issue}")
+    if any(issue.severity == ValidationSeverity.ERROR for issue in issues):
+        print(f"STJ file generated with errors: {output_path} ({count} segments)")
+        return 1
+    print(f"STJ file generated: {output_path} ({count} segments)")
+    return 0
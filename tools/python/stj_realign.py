@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""stj-realign: rebuild word timings that no longer match edited segment text.
+
+Every segment whose ``words`` drifted from its ``text`` is realigned with
+``stjlib.alignment.realign_segment``.  Files are processed in parallel and
+written either to an output directory or back in place.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib import StandardTranscriptionJSON  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib import StandardTranscriptionJSON  # noqa: E402
+
+from stjlib.alignment import DEFAULT_BAND, realign_transcript  # noqa: E402
+from stjlib.streaming import STJWriter  # noqa: E402
+
+from stj_inputs import expand_inputs  # noqa: E402
+
+
+def write_stj(stj, path):
+    """Write a loaded STJ document to ``path``."""
+    transcript = stj.transcript
+    with STJWriter(path, version=stj.version, metadata=stj.metadata,
+                   speakers=transcript.speakers, styles=transcript.styles) as writer:
+        writer.write_segments(transcript.segments)
+
+
+def realign_file(stj_file, output_dir=None, band=DEFAULT_BAND):
+    """Realign one file.
+
+    Returns:
+        tuple: (stj_file, number of segments realigned, output path or None, error or None)
+    """
+    try:
+        stj = StandardTranscriptionJSON.from_file(stj_file)
+        changed = realign_transcript(stj, band)
+        target = os.path.join(output_dir, os.path.basename(stj_file)) if output_dir else stj_file
+        if changed or output_dir:
+            write_stj(stj, target)
+        else:
+            target = None
+    except Exception as e:
+        return stj_file, 0, None, str(e)
+    return stj_file, changed, target, None
+
+
+def realign_all(files, output_dir=None, band=DEFAULT_BAND, jobs=None):
+    """Realign ``files``, yielding results as files complete."""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) <= 1:
+        for stj_file in files:
+            yield realign_file(stj_file, output_dir, band)
+        return
+
+    # Only multi-file runs pay for importing the process pool machinery
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+        futures = [pool.submit(realign_file, f, output_dir, band) for f in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='stj-realign',
+        description="Realign word timings with edited segment text.",
+    )
+    parser.add_argument('inputs', nargs='+', help="STJ files, directories or glob patterns")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('-o', '--output-dir', help="Directory for the realigned files")
+    target.add_argument('--in-place', action='store_true', help="Rewrite changed files in place")
+    parser.add_argument('--band', type=int, default=DEFAULT_BAND,
+                        help=f"Alignment band width in tokens (default: {DEFAULT_BAND})")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Only print the summary and failures")
+    args = parser.parse_args()
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("No STJ files found.")
+        sys.exit(1)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    failures = 0
+    segments = 0
+    for stj_file, changed, target, error in realign_all(files, args.output_dir, args.band, args.jobs):
+        if error:
+            failures += 1
+            print(f"FAILED {stj_file}: {error}")
+            continue
+        segments += changed
+        if not args.quiet and changed:
+            print(f"{stj_file}: {changed} segments realigned -> {target}")
+
+    print(f"Realigned {segments} segments in {len(files) - failures}/{len(files)} files "
+          f"in {time.perf_counter() - started:.2f}s")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
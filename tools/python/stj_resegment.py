@@ -0,0 +1,206 @@
+"""Re-segment STJ transcripts into readable subtitle cues.
+
+Segments are split into cues using their word timings so that no cue exceeds
+a maximum line length, number of lines or duration.  Segments without
+complete word timing are split on whitespace and their duration is shared
+between tokens by character count.  Every word is visited once, in order,
+so the cost grows linearly with the transcript.
+
+Cues carry their per-word timings, which the writers in ``stj_writers`` use
+for karaoke output (ASS ``\\k`` tags and WebVTT inline timestamps).
+"""
+
+from stj_writers import format_vtt_timestamp, seconds_to_ms
+
+DEFAULT_MAX_CHARS = 42
+DEFAULT_MAX_LINES = 2
+DEFAULT_MAX_DURATION = 7.0
+
+
+class CueLimits:
+    """Limits applied when splitting segments into cues.
+
+    Args:
+        max_chars: Maximum characters per line
+        max_lines: Maximum lines per cue
+        max_duration: Maximum cue duration in seconds
+    """
+
+    def __init__(self, max_chars=DEFAULT_MAX_CHARS, max_lines=DEFAULT_MAX_LINES,
+                 max_duration=DEFAULT_MAX_DURATION):
+        if max_chars < 1 or max_lines < 1 or max_duration <= 0:
+            raise ValueError("Cue limits must be positive")
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.max_duration_ms = seconds_to_ms(max_duration)
+
+
+class TimedCue:
+    """A cue built from timed words.
+
+    Attributes:
+        lines: List of lines, each a list of ``(text, start_ms, end_ms)`` words
+        speaker_id: Speaker of the source segment
+        style_id: Style of the source segment
+    """
+
+    __slots__ = ('lines', 'speaker_id', 'style_id')
+
+    def __init__(self, speaker_id=None, style_id=None):
+        self.lines = [[]]
+        self.speaker_id = speaker_id
+        self.style_id = style_id
+
+    @property
+    def start_ms(self):
+        return self.lines[0][0][1]
+
+    @property
+    def end_ms(self):
+        return self.lines[-1][-1][2]
+
+    @property
+    def text(self):
+        return '\n'.join(' '.join(word[0] for word in line) for line in self.lines)
+
+    def words(self):
+        for line_no, line in enumerate(self.lines):
+            for word_no, word in enumerate(line):
+                yield line_no > 0 and word_no == 0, word
+
+
+def _segment_words(segment):
+    """Return ``(text, start_ms, end_ms)`` tuples for a segment, or None if untimed."""
+    words = segment.words
+    if words and all(w.start is not None and w.end is not None for w in words):
+        return [(w.text, seconds_to_ms(w.start), seconds_to_ms(w.end)) for w in words]
+    if segment.start is None or segment.end is None:
+        return None
+
+    tokens = segment.text.split()
+    if not tokens:
+        return None
+    start_ms = seconds_to_ms(segment.start)
+    duration = seconds_to_ms(segment.end) - start_ms
+    total_chars = sum(len(t) + 1 for t in tokens)
+    result = []
+    consumed = 0
+    for token in tokens:
+        token_start = start_ms + duration * consumed // total_chars
+        consumed += len(token) + 1
+        result.append((token, token_start, start_ms + duration * consumed // total_chars))
+    return result
+
+
+def resegment(segments, limits=None):
+    """Split segments into cues that respect ``limits``.
+
+    Lines are filled greedily; a new cue starts when the next word would add
+    a line beyond ``max_lines`` or stretch the cue past ``max_duration``.  A
+    single word that alone exceeds a limit still gets its own cue.
+
+    Args:
+        segments: Iterable of STJ ``Segment`` objects
+        limits: ``CueLimits``; defaults are used when omitted
+
+    Yields:
+        TimedCue: Cues in input order
+    """
+    limits = limits or CueLimits()
+    max_chars = limits.max_chars
+    max_lines = limits.max_lines
+    max_duration_ms = limits.max_duration_ms
+
+    for segment in segments:
+        words = _segment_words(segment)
+        if not words:
+            continue
+        cue = TimedCue(segment.speaker_id, segment.style_id)
+        line = cue.lines[0]
+        line_len = 0
+        for word in words:
+            text_len = len(word[0])
+            if line:
+                too_long = word[2] - cue.start_ms > max_duration_ms
+                wraps = line_len + 1 + text_len > max_chars
+                if too_long or (wraps and len(cue.lines) >= max_lines):
+                    yield cue
+                    cue = TimedCue(segment.speaker_id, segment.style_id)
+                    line = cue.lines[0]
+                    line_len = 0
+                elif wraps:
+                    line = []
+                    cue.lines.append(line)
+                    line_len = 0
+            line_len += text_len + (1 if line else 0)
+            line.append(word)
+        yield cue
+
+
+def ass_karaoke_text(cue):
+    """Return cue text with ASS ``{\\kNN}`` tags (centiseconds) before each word."""
+    parts = []
+    cursor = cue.start_ms // 10
+    for new_line, (text, start_ms, end_ms) in cue.words():
+        if parts:
+            parts.append('\n' if new_line else ' ')
+        start_cs = start_ms // 10
+        if start_cs > cursor:
+            parts.append(f"{{\\k{start_cs - cursor}}}")
+        end_cs = max(end_ms // 10, start_cs)
+        parts.append(f"{{\\k{end_cs - start_cs}}}{text}")
+        cursor = end_cs
+    return ''.join(parts)
+
+
+def vtt_karaoke_text(cue):
+    """Return cue text with WebVTT inline timestamps before each later word."""
+    parts = []
+    for new_line, (text, start_ms, _) in cue.words():
+        if parts:
+            parts.append('\n' if new_line else ' ')
+            parts.append(f"<{format_vtt_timestamp(start_ms)}>")
+        parts.append(text)
+    return ''.join(parts)
+
+
+def add_resegment_arguments(parser, karaoke=False):
+    """Add cue re-segmentation options to an argparse parser."""
+    group = parser.add_argument_group('cue re-segmentation')
+    group.add_argument('--resegment', action='store_true',
+                       help="Split segments into cues using word timings")
+    group.add_argument('--max-chars', type=int,
+                       help=f"Maximum characters per line (default: {DEFAULT_MAX_CHARS})")
+    group.add_argument('--max-lines', type=int,
+                       help=f"Maximum lines per cue (default: {DEFAULT_MAX_LINES})")
+    group.add_argument('--max-duration', type=float,
+                       help=f"Maximum cue duration in seconds (default: {DEFAULT_MAX_DURATION})")
+    if karaoke:
+        group.add_argument('--karaoke', action='store_true',
+                           help="Emit per-word karaoke timing (implies --resegment)")
+
+
+def limits_from_args(args, parser=None):
+    """Return ``CueLimits`` if re-segmentation was requested on the command line.
+
+    Limits that are not positive are reported through ``parser.error`` when
+    a parser is given, and raise ``ValueError`` otherwise.
+    """
+    requested = (
+        args.resegment or getattr(args, 'karaoke', False)
+        or args.max_chars is not None or args.max_lines is not None
+        or args.max_duration is not None
+    )
+    if not requested:
+        return None
+    try:
+        return CueLimits(
+            max_chars=DEFAULT_MAX_CHARS if args.max_chars is None else args.max_chars,
+            max_lines=DEFAULT_MAX_LINES if args.max_lines is None else args.max_lines,
+            max_duration=(DEFAULT_MAX_DURATION if args.max_duration is None
+                          else args.max_duration),
+        )
+    except ValueError as e:
+        if parser is None:
+            raise
+        parser.error(str(e))
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""stj-serve: a local HTTP service for validating and converting STJ files.
+
+One long-running service replaces a process launch per file.  Requests are
+handled by a pool of worker processes that import stjlib and load the ISO
+639 language tables once, when they start.
+
+Endpoints:
+    POST /validate          STJ document in, JSON ``{"valid", "issues"}`` out
+    POST /convert/<format>  STJ document in, subtitle file out (srt, vtt,
+                            ass or ttml); 422 with the issues if invalid
+    GET  /metrics           Request counters and latency histograms in the
+                            Prometheus text format
+
+Request bodies are streamed to a spool file and converted output is streamed
+back from one, so neither is held in memory.  Only a bounded number of
+requests are processed at once; beyond that the service answers 503 with a
+``Retry-After`` header, and bodies over the size limit get 413.
+
+Only the standard library is used.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib import StandardTranscriptionJSON, STJError, TimeMode  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib import StandardTranscriptionJSON, STJError, TimeMode  # noqa: E402
+
+from stj_convert import WRITERS  # noqa: E402
+
+CONTENT_TYPES = {
+    'srt': 'application/x-subrip; charset=utf-8',
+    'vtt': 'text/vtt; charset=utf-8',
+    'ass': 'text/x-ssa; charset=utf-8',
+    'ttml': 'application/ttml+xml; charset=utf-8',
+}
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_PENDING = 64
+DEFAULT_MAX_BODY = 256 * 1024 * 1024
+DEFAULT_TIMEOUT = 60
+COPY_CHUNK_SIZE = 64 * 1024
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def warm_worker():
+    """Import the validators and load the language tables in a new worker."""
+    from stjlib.validation import validate_language_code
+
+    validate_language_code('en', 'warmup')
+
+
+def validate_document(path):
+    """Validate the STJ file at ``path`` and return its issues as dictionaries."""
+    stj = StandardTranscriptionJSON.from_file(path, time_mode=TimeMode.MILLISECONDS)
+    return [issue.to_dict() for issue in stj.validate(raise_exception=False)]
+
+
+def convert_document(path, fmt, output):
+    """Convert the STJ file at ``path`` to ``fmt`` at ``output``.
+
+    Returns the validation issues as dictionaries; nothing is written unless
+    the list is empty.
+    """
+    stj = StandardTranscriptionJSON.from_file(path, time_mode=TimeMode.MILLISECONDS)
+    issues = stj.validate(raise_exception=False)
+    if issues:
+        return [issue.to_dict() for issue in issues]
+    WRITERS[fmt](stj, output)
+    return []
+
+
+class RequestError(Exception):
+    """An error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class Metrics:
+    """Thread-safe request counters and latency histograms."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._histograms = {}
+        self._in_flight = 0
+
+    def request_started(self):
+        """Count a request that is now being processed."""
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self):
+        """Count a request that is no longer being processed."""
+        with self._lock:
+            self._in_flight -= 1
+
+    @property
+    def in_flight(self):
+        with self._lock:
+            return self._in_flight
+
+    def observe(self, endpoint, status, seconds):
+        with self._lock:
+            key = (endpoint, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            counts, total = self._histograms.get(endpoint, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            self._histograms[endpoint] = (counts, total + seconds)
+
+    def render(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                '# HELP stj_requests_total Requests handled, by endpoint and status.',
+                '# TYPE stj_requests_total counter',
+            ]
+            for (endpoint, status), count in sorted(self._requests.items()):
+                lines.append(
+                    f'stj_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+            lines += [
+                '# HELP stj_request_duration_seconds Request latency, by endpoint.',
+                '# TYPE stj_request_duration_seconds histogram',
+            ]
+            for endpoint, (counts, total) in sorted(self._histograms.items()):
+                observed = sum(c for (e, _), c in self._requests.items() if e == endpoint)
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(
+                        f'stj_request_duration_seconds_bucket{{endpoint="{endpoint}",'
+                        f'le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f'stj_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} '
+                    f'{observed}'
+                )
+                lines.append(f'stj_request_duration_seconds_sum{{endpoint="{endpoint}"}} {total}')
+                lines.append(
+                    f'stj_request_duration_seconds_count{{endpoint="{endpoint}"}} {observed}'
+                )
+            lines += [
+                '# HELP stj_requests_in_flight Requests being processed.',
+                '# TYPE stj_requests_in_flight gauge',
+                f'stj_requests_in_flight {self._in_flight}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+class STJService(ThreadingHTTPServer):
+    """HTTP server owning the worker pool, admission limit and metrics.
+
+    Args:
+        address: ``(host, port)`` to listen on; port 0 picks a free port
+        jobs: Number of worker processes (default: CPU count)
+        max_pending: Requests processed at once before answering 503
+        max_body: Largest accepted request body in bytes
+        timeout: Socket timeout in seconds for reading requests
+        spool_dir: Directory for request and response spool files
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, jobs=None, max_pending=DEFAULT_MAX_PENDING,
+                 max_body=DEFAULT_MAX_BODY, timeout=DEFAULT_TIMEOUT, spool_dir=None):
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.pool = ProcessPoolExecutor(max_workers=jobs, initializer=warm_worker)
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.max_body = max_body
+        self.request_timeout = timeout
+        self.spool_dir = spool_dir
+        self.metrics = Metrics()
+        super().__init__(address, STJRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class STJRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'stj-serve'
+
+    def setup(self):
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def log_message(self, format, *args):
+        # Access logging is left to the metrics endpoint
+        pass
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/metrics':
+            self._send_bytes(200, self.server.metrics.render().encode('utf-8'),
+                             'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self._send_json(404, {'error': f"Not found: {path}"})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        if path == '/validate':
+            self._handle('validate', self._validate)
+        elif path.startswith('/convert/'):
+            fmt = path[len('/convert/'):]
+            if fmt not in WRITERS:
+                self._refuse_body()
+                self._send_json(404, {'error': f"Unknown format: {fmt}",
+                                      'formats': sorted(WRITERS)})
+            else:
+                self._handle('convert_' + fmt, lambda spool: self._convert(spool, fmt))
+        else:
+            self._refuse_body()
+            self._send_json(404, {'error': f"Not found: {path}"})
+
+    def _handle(self, endpoint, process):
+        server = self.server
+        started = time.perf_counter()
+        status = 500
+        if not server.slots.acquire(blocking=False):
+            self._refuse_body()
+            status = 503
+            self._send_json(503, {'error': "Server busy"}, {'Retry-After': '1'})
+            server.metrics.observe(endpoint, status, time.perf_counter() - started)
+            return
+        server.metrics.request_started()
+        spool = tempfile.NamedTemporaryFile(
+            dir=server.spool_dir, suffix='.stj.json', delete=False)
+        try:
+            with spool:
+                self._read_body(spool)
+            status = process(spool.name)
+        except RequestError as e:
+            status = e.status
+            self._send_json(e.status, {'error': str(e)}, e.headers)
+        except (json.JSONDecodeError, STJError) as e:
+            status = 400
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            status = 500
+            self._send_json(500, {'error': f"Internal error: {e}"})
+        finally:
+            os.remove(spool.name)
+            server.metrics.request_finished()
+            server.slots.release()
+            server.metrics.observe(endpoint, status, time.perf_counter() - started)
+
+    def _validate(self, spool):
+        issues = self.server.pool.submit(validate_document, spool).result()
+        errors = [i for i in issues if i['severity'] == 'ERROR']
+        self._send_json(200, {'valid': not errors, 'issues': issues})
+        return 200
+
+    def _convert(self, spool, fmt):
+        output = spool + '.' + fmt
+        try:
+            issues = self.server.pool.submit(convert_document, spool, fmt, output).result()
+            if issues:
+                self._send_json(422, {'error': "Validation failed", 'issues': issues})
+                return 422
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPES[fmt])
+            self.send_header('Content-Length', str(os.path.getsize(output)))
+            self.end_headers()
+            with open(output, 'rb') as f:
+                shutil.copyfileobj(f, self.wfile, COPY_CHUNK_SIZE)
+            return 200
+        finally:
+            if os.path.exists(output):
+                os.remove(output)
+
+    def _too_large(self):
+        self.close_connection = True
+        return RequestError(413, f"Body exceeds {self.server.max_body} bytes")
+
+    def _body_chunks(self):
+        """Yield the request body in pieces, decoding chunked transfer encoding.
+
+        Raises 413 as soon as the body is known to exceed ``max_body``.
+        """
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            received = 0
+            while True:
+                size_line = self.rfile.readline(1024)
+                try:
+                    size = int(size_line.split(b';')[0].strip(), 16)
+                except ValueError:
+                    raise RequestError(400, "Malformed chunked body")
+                received += size
+                if received > self.server.max_body:
+                    raise self._too_large()
+                if size == 0:
+                    # Skip trailers up to the blank line
+                    while self.rfile.readline(1024).strip():
+                        pass
+                    return
+                while size:
+                    piece = self.rfile.read(min(size, COPY_CHUNK_SIZE))
+                    if not piece:
+                        raise RequestError(400, "Truncated chunked body")
+                    size -= len(piece)
+                    yield piece
+                self.rfile.readline(1024)
+            return
+
+        length = self.headers.get('Content-Length')
+        if length is None:
+            raise RequestError(411, "Content-Length or chunked transfer encoding required")
+        try:
+            remaining = int(length)
+        except ValueError:
+            raise RequestError(400, "Invalid Content-Length")
+        if remaining > self.server.max_body:
+            raise self._too_large()
+        while remaining:
+            piece = self.rfile.read(min(remaining, COPY_CHUNK_SIZE))
+            if not piece:
+                raise RequestError(400, "Truncated body")
+            remaining -= len(piece)
+            yield piece
+
+    def _read_body(self, dest):
+        for piece in self._body_chunks():
+            dest.write(piece)
+
+    def _refuse_body(self):
+        """Close the connection after responding, leaving the request body unread.
+
+        Reading a body only to throw it away would keep a handler thread
+        busy for as long as the client keeps sending.
+        """
+        if (self.headers.get('Transfer-Encoding')
+                or self.headers.get('Content-Length', '0').strip() != '0'):
+            self.close_connection = True
+
+    def _send_bytes(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers=None):
+        self._send_bytes(status, json.dumps(payload).encode('utf-8'),
+                         'application/json', headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='stj-serve',
+        description="Serve STJ validation and conversion over HTTP.",
+    )
+    parser.add_argument('--host', default='127.0.0.1', help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING,
+                        help=f"Requests processed at once before answering 503 "
+                        f"(default: {DEFAULT_MAX_PENDING})")
+    parser.add_argument('--max-body-mb', type=float, default=DEFAULT_MAX_BODY / 2 ** 20,
+                        help="Largest accepted request body in MiB (default: 256)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Socket timeout in seconds (default: {DEFAULT_TIMEOUT})")
+    args = parser.parse_args()
+
+    try:
+        server = STJService((args.host, args.port), jobs=args.jobs,
+                            max_pending=args.max_pending,
+                            max_body=int(args.max_body_mb * 2 ** 20), timeout=args.timeout)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    host, port = server.server_address[:2]
+    print(f"Serving STJ on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
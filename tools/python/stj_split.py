@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""stj-split: split an STJ file into shards for parallel processing.
+
+Shards are cut on segment boundaries by duration, segment count or size.
+Each shard keeps only the speakers and styles it uses and records its time
+offset, so ``stjlib.merge_transcripts`` can reassemble the original.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib.chunks import SPLIT_MODES, split_transcript  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib.chunks import SPLIT_MODES, split_transcript  # noqa: E402
+
+from stjlib.compression import strip_compression_suffix  # noqa: E402
+
+STJ_SUFFIXES = ('.stj.json', '.json')
+
+
+def default_prefix(stj_file):
+    """Return the input file name without its STJ suffix."""
+    name = Path(strip_compression_suffix(stj_file)).name
+    for suffix in STJ_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='stj-split',
+        description="Split an STJ file into shards on segment boundaries.",
+    )
+    parser.add_argument('stj_file', help="Path to the STJ file")
+    parser.add_argument('output_dir', help="Directory for the shard files")
+    parser.add_argument('--by', choices=SPLIT_MODES, default='duration',
+                        help="Split by duration (seconds), segment count or bytes (default: duration)")
+    amount = parser.add_mutually_exclusive_group(required=True)
+    amount.add_argument('--size', type=float,
+                        help="Shard size in seconds, segments or bytes")
+    amount.add_argument('-n', '--count', type=int,
+                        help="Number of evenly sized shards to produce")
+    parser.add_argument('--prefix', help="Shard file name prefix (default: input file name)")
+    args = parser.parse_args()
+
+    try:
+        paths = split_transcript(
+            args.stj_file, args.output_dir, by=args.by, size=args.size, count=args.count,
+            prefix=args.prefix or default_prefix(args.stj_file),
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    for path in paths:
+        print(path)
+    print(f"Wrote {len(paths)} shards to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
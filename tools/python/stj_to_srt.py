@@ -3,7 +3,6 @@
 import argparse
 import sys
 from pathlib import Path
-from datetime import timedelta
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
@@ -17,38 +16,35 @@ def _ensure_vendor_path():
 
 
 try:
-    from stjlib import StandardTranscriptionJSON
-    import srt  # noqa: E402
+    from stjlib import StandardTranscriptionJSON, TimeMode
 except ImportError:
     _ensure_vendor_path()
-    from stjlib import StandardTranscriptionJSON
-    import srt  # noqa: E402
+    from stjlib import StandardTranscriptionJSON, TimeMode
 
-def generate_srt(stj_file_path, output_srt_path):
+from stj_resegment import add_resegment_arguments, limits_from_args, resegment  # noqa: E402
+from stj_writers import SRTWriter, open_output  # noqa: E402
+
+def write_srt(stj, output_srt_path, limits=None):
+    with open_output(output_srt_path) as f, SRTWriter(f) as writer:
+        if limits:
+            writer.write_cues(resegment(stj.transcript.segments, limits))
+        else:
+            writer.write_segments(stj.transcript.segments)
+
+def generate_srt(stj_file_path, output_srt_path, limits=None):
     # Load and validate STJ file using stjlib
-    stj = StandardTranscriptionJSON.from_file(stj_file_path, validate=True)
-    segments = stj.transcript.segments
-    
-    subtitles = []
-    for index, seg in enumerate(segments, start=1):
-        start = timedelta(seconds=seg.start)
-        end = timedelta(seconds=seg.end)
-        speaker = seg.speaker_id if hasattr(seg, 'speaker_id') else ''
-        text = seg.text
-        content = f"{speaker}: {text}" if speaker else text
-        subtitles.append(srt.Subtitle(index=index, start=start, end=end, content=content))
-    
-    srt_content = srt.compose(subtitles)
-    with open(output_srt_path, 'w', encoding='utf-8') as f:
-        f.write(srt_content)
+    stj = StandardTranscriptionJSON.from_file(stj_file_path, validate=True,
+                                              time_mode=TimeMode.MILLISECONDS)
+    write_srt(stj, output_srt_path, limits)
     print(f"SRT file generated: {output_srt_path}")
 
 def main():
     parser = argparse.ArgumentParser(description="Convert STJ to SRT")
     parser.add_argument('stj_file', help="Path to the STJ file")
     parser.add_argument('output_srt', help="Path to the output SRT file")
+    add_resegment_arguments(parser)
     args = parser.parse_args()
-    generate_srt(args.stj_file, args.output_srt)
+    generate_srt(args.stj_file, args.output_srt, limits_from_args(args, parser))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+VENDOR_DIR = PROJECT_ROOT / 'vendor' / 'python'
+
+
+def _ensure_vendor_path():
+    if VENDOR_DIR.exists():
+        vendor_path = str(VENDOR_DIR)
+        if vendor_path not in sys.path:
+            sys.path.append(vendor_path)
+
+
+try:
+    from stjlib import StandardTranscriptionJSON, TimeMode  # noqa: E402
+except ImportError:
+    _ensure_vendor_path()
+    from stjlib import StandardTranscriptionJSON, TimeMode  # noqa: E402
+
+from stj_resegment import add_resegment_arguments, limits_from_args, resegment  # noqa: E402
+from stj_writers import TTMLWriter, open_output  # noqa: E402
+
+def write_ttml(stj, output_ttml_path, limits=None):
+    transcript = stj.transcript
+    metadata = stj.metadata
+    language = metadata.languages[0] if metadata and metadata.languages else None
+
+    with open_output(output_ttml_path) as f, TTMLWriter(
+        f, styles=transcript.styles, speakers=transcript.speakers, language=language
+    ) as writer:
+        if limits:
+            writer.write_cues(resegment(transcript.segments, limits))
+        else:
+            writer.write_segments(transcript.segments)
+
+def generate_ttml(stj_file_path, output_ttml_path, limits=None):
+    # Load and validate STJ file using stjlib
+    stj = StandardTranscriptionJSON.from_file(stj_file_path, validate=True,
+                                              time_mode=TimeMode.MILLISECONDS)
+    write_ttml(stj, output_ttml_path, limits)
+    print(f"TTML file generated: {output_ttml_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert STJ to TTML (IMSC 1 Text Profile) subtitles")
+    parser.add_argument('stj_file', help="Path to the STJ file")
+    parser.add_argument('output_ttml', help="Path to the output TTML file")
+    add_resegment_arguments(parser)
+    args = parser.parse_args()
+    generate_ttml(args.stj_file, args.output_ttml, limits_from_args(args, parser))
+
+if __name__ == "__main__":
+    main()
@@ -16,45 +16,43 @@ def _ensure_vendor_path():
 
 
 try:
-    import webvtt  # noqa: E402
-    from stjlib import StandardTranscriptionJSON  # noqa: E402
+    from stjlib import StandardTranscriptionJSON, TimeMode  # noqa: E402
 except ImportError:
     _ensure_vendor_path()
-    import webvtt  # noqa: E402
-    from stjlib import StandardTranscriptionJSON  # noqa: E402
+    from stjlib import StandardTranscriptionJSON, TimeMode  # noqa: E402
+
+from stj_resegment import (  # noqa: E402
+    CueLimits, add_resegment_arguments, limits_from_args, resegment, vtt_karaoke_text,
+)
+from stj_writers import VTTWriter, format_vtt_timestamp, open_output, seconds_to_ms  # noqa: E402
 
 def format_timestamp(seconds):
-    milliseconds = int((seconds - int(seconds)) * 1000)
-    total_seconds = int(seconds)
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    seconds = (total_seconds % 60)
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
-
-def generate_vtt(stj_file_path, output_vtt_path):
+    return format_vtt_timestamp(seconds_to_ms(seconds))
+
+def write_vtt(stj, output_vtt_path, limits=None, karaoke=False):
+    if karaoke and not limits:
+        limits = CueLimits()
+    with open_output(output_vtt_path) as f, VTTWriter(f) as writer:
+        if limits:
+            writer.write_cues(resegment(stj.transcript.segments, limits),
+                              text=vtt_karaoke_text if karaoke else None)
+        else:
+            writer.write_segments(stj.transcript.segments)
+
+def generate_vtt(stj_file_path, output_vtt_path, limits=None, karaoke=False):
     # Load and validate STJ file using stjlib
-    stj = StandardTranscriptionJSON.from_file(stj_file_path, validate=True)
-    segments = stj.transcript.segments
-    
-    vtt = webvtt.WebVTT()
-    for seg in segments:
-        caption = webvtt.Caption()
-        caption.start = format_timestamp(seg.start)
-        caption.end = format_timestamp(seg.end)
-        speaker = seg.speaker_id if hasattr(seg, 'speaker_id') else ''
-        text = seg.text
-        content = f"{speaker}: {text}" if speaker else text
-        caption.text = content
-        vtt.captions.append(caption)
-    vtt.save(output_vtt_path)
+    stj = StandardTranscriptionJSON.from_file(stj_file_path, validate=True,
+                                              time_mode=TimeMode.MILLISECONDS)
+    write_vtt(stj, output_vtt_path, limits, karaoke)
     print(f"WebVTT file generated: {output_vtt_path}")
 
 def main():
     parser = argparse.ArgumentParser(description="Convert STJ to WebVTT")
     parser.add_argument('stj_file', help="Path to the STJ file")
     parser.add_argument('output_vtt', help="Path to the output VTT file")
+    add_resegment_arguments(parser, karaoke=True)
     args = parser.parse_args()
-    generate_vtt(args.stj_file, args.output_vtt)
+    generate_vtt(args.stj_file, args.output_vtt, limits_from_args(args, parser), args.karaoke)
 
 if __name__ == "__main__":
     main()
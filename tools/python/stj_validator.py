@@ -3,6 +3,7 @@
 import argparse
 import json
 import sys
+import time
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -16,31 +17,55 @@ def _ensure_vendor_path():
             sys.path.append(vendor_path)
 
 
-try:
-    import jsonschema  # noqa: E402
-except ImportError:
-    _ensure_vendor_path()
+def _import_jsonschema():
+    """Import jsonschema on demand, or return None if it is unavailable.
+
+    jsonschema and its dependencies take longer to import than the rest of
+    the validator, so they are only loaded when schema validation is used.
+    """
     try:
-        import jsonschema  # noqa: E402
+        import jsonschema
     except ImportError:
-        jsonschema = None
+        _ensure_vendor_path()
+        try:
+            import jsonschema
+        except ImportError:
+            return None
+    return jsonschema
 
 try:
     from stjlib import StandardTranscriptionJSON  # noqa: E402
+    from stjlib.compression import open_text  # noqa: E402
 except ImportError:
     _ensure_vendor_path()
     try:
         from stjlib import StandardTranscriptionJSON  # noqa: E402
+        from stjlib.compression import open_text  # noqa: E402
     except ImportError:
         StandardTranscriptionJSON = None
+        open_text = None
+
+from stj_watch import add_watch_arguments, watch  # noqa: E402
 
 SCHEMA_PATH = PROJECT_ROOT / 'spec' / 'schema' / 'latest' / 'stj-schema.json'
 
 
+def _load_json(stj_file):
+    """Load a JSON file, decompressing it if stjlib is available."""
+    if open_text is None:
+        with open(stj_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with open_text(stj_file, encoding='utf-8-sig') as f:
+        return json.load(f)
+
+
 def validate_with_schema(stj_file: str):
     """Validate an STJ file against the bundled JSON schema."""
-    with open(stj_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    jsonschema = _import_jsonschema()
+    if jsonschema is None:
+        raise RuntimeError("Schema validation requires the jsonschema package")
+
+    data = _load_json(stj_file)
 
     if not SCHEMA_PATH.exists():
         raise RuntimeError(f"Schema file not found: {SCHEMA_PATH}")
@@ -59,8 +84,7 @@ def validate_with_schema(stj_file: str):
 
 def basic_validation(stj_file: str):
     """Lightweight fallback validation when dependencies are unavailable."""
-    with open(stj_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = _load_json(stj_file)
 
     issues = []
     if not isinstance(data, dict):
@@ -102,19 +126,81 @@ def basic_validation(stj_file: str):
     return issues
 
 
+def validate_file(stj_file: str, schema: bool = False, cache=None):
+    """Validate an STJ file and return its issues.
+
+    Uses stjlib, or the JSON schema with ``schema`` or when stjlib is
+    unavailable.  ``cache`` is an optional ``stjlib.ValidationCache`` that
+    stjlib results are looked up in and stored to.
+    """
+    if schema:
+        return validate_with_schema(stj_file)
+    if StandardTranscriptionJSON is not None and cache is not None:
+        return cache.validate_file(stj_file)
+    if StandardTranscriptionJSON is not None:
+        stj = StandardTranscriptionJSON.from_file(stj_file, validate=False)
+        return stj.validate(raise_exception=False)
+    if _import_jsonschema() is not None:
+        return validate_with_schema(stj_file)
+    return basic_validation(stj_file)
+
+
+def check_file(stj_file: str, schema: bool = False, cache=None):
+    """Validate an STJ file in watch mode, where errors must not stop the watch.
+
+    Returns:
+        tuple: (stj_file, list of issue strings, error message or None)
+    """
+    try:
+        return stj_file, [str(issue) for issue in validate_file(stj_file, schema, cache)], None
+    except json.JSONDecodeError as e:
+        return stj_file, [], f"Invalid JSON - {e}"
+    except Exception as e:
+        return stj_file, [], str(e)
+
+
+def _report(result):
+    stj_file, issues, error = result
+    stamp = time.strftime('%H:%M:%S')
+    if error:
+        print(f"[{stamp}] ERROR {stj_file}: {error}", flush=True)
+    elif issues:
+        print(f"[{stamp}] INVALID {stj_file} ({len(issues)} issues)")
+        for i, issue in enumerate(issues, 1):
+            print(f"  {i}. {issue}")
+        sys.stdout.flush()
+    else:
+        print(f"[{stamp}] OK {stj_file}", flush=True)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Validate an STJ file.")
-    parser.add_argument('stj_file', help="Path to the STJ file to validate.")
+    parser.add_argument('stj_file', help="Path to the STJ file to validate; with --watch, "
+                        "also a directory or glob pattern.")
+    parser.add_argument('--schema', action='store_true',
+                        help="Validate against the JSON schema instead of with stjlib.")
+    parser.add_argument('--cache', nargs='?', const='', default=None, metavar='PATH',
+                        help="Reuse results of previous runs on unchanged files, from the "
+                        "given cache database or the default stjlib cache.")
+    parser.add_argument('--cache-size-mb', type=float, default=64,
+                        help="Size limit of the validation cache in MiB (default: 64).")
+    add_watch_arguments(parser, jobs=True)
     args = parser.parse_args()
 
     try:
-        if StandardTranscriptionJSON is not None:
-            stj = StandardTranscriptionJSON.from_file(args.stj_file, validate=False)
-            validation_issues = stj.validate(raise_exception=False)
-        elif jsonschema is not None:
-            validation_issues = validate_with_schema(args.stj_file)
-        else:
-            validation_issues = basic_validation(args.stj_file)
+        cache = None
+        if StandardTranscriptionJSON is not None and args.cache is not None and not args.schema:
+            from stjlib import ValidationCache
+
+            cache = ValidationCache(args.cache or None,
+                                    max_bytes=int(args.cache_size_mb * 2 ** 20))
+
+        if args.watch:
+            watch([args.stj_file], check_file, (args.schema, cache), _report, jobs=args.jobs,
+                  interval=args.interval, debounce=args.debounce, use_inotify=not args.poll)
+            sys.exit(0)
+
+        validation_issues = validate_file(args.stj_file, args.schema, cache)
 
         if not validation_issues:
             print("Validation successful! No issues found.")
@@ -0,0 +1,359 @@
+"""Watch mode for stj-validator and stj-convert.
+
+With ``--watch`` a tool keeps running over a set of files, directories or
+glob patterns and processes each STJ file again when it changes.  A file
+counts as changed when its modification time or size differs from when it
+was last processed and its content hash does too, so files that are only
+touched are never re-parsed.  Changes are debounced: a file is processed once
+it has been left alone for the debounce period, so an editor saving several
+times in a row triggers a single run.
+
+On Linux the watched directories are monitored with inotify, called through
+libc, and only the files named in its events are looked at.  Elsewhere, or
+when inotify is unavailable or not wanted (changes made by other hosts on a
+network share do not raise events), the inputs are re-scanned with ``stat``
+every poll interval.  Changed files are processed in a pool of worker
+processes kept for the whole session.
+"""
+
+import fnmatch
+import glob
+import hashlib
+import os
+import select
+import signal
+import stat
+import struct
+import sys
+import time
+
+from stj_inputs import STJ_PATTERNS, expand_inputs
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 0.5
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# inotify(7) event flags
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# struct inotify_event without its variable-length name
+_EVENT = struct.Struct('iIII')
+
+
+def file_digest(path):
+    """Return the SHA-256 hex digest of the bytes of ``path``."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _ignore_interrupt():
+    """Leave Ctrl-C to the watching process, which shuts the pool down."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class _Inotify:
+    """Change events for a set of directories, from Linux inotify."""
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, libc, fd):
+        self._libc = libc
+        self._fd = fd
+        self._directories = {}  # watch descriptor -> (directory, recursive)
+
+    @classmethod
+    def open(cls, roots):
+        """Watch ``roots``, a list of (directory, recursive) pairs.
+
+        Returns None if inotify is unavailable or a directory cannot be
+        watched, for example beyond the per-user watch limit.
+        """
+        if not sys.platform.startswith('linux'):
+            return None
+        import ctypes
+
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        inotify = cls(libc, fd)
+        try:
+            for directory, recursive in roots:
+                inotify.add(directory, recursive)
+        except OSError:
+            inotify.close()
+            return None
+        return inotify
+
+    def add(self, directory, recursive):
+        """Watch ``directory`` and return the files already in it."""
+        files = []
+        for root, _dirs, names in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(root), self.MASK)
+            if wd < 0:
+                raise OSError(f"cannot watch {root}")
+            previous = self._directories.get(wd, (root, False))
+            self._directories[wd] = (root, recursive or previous[1])
+            files.extend(os.path.join(root, name) for name in names)
+            if not recursive:
+                break
+        return files
+
+    def read(self, timeout):
+        """Wait up to ``timeout`` seconds and return the paths named by events.
+
+        Returns None when events were lost and the inputs must be re-scanned.
+        """
+        paths = set()
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return paths
+        lost = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return None if lost else paths
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    lost = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._directories.pop(wd, None)
+                    continue
+                if wd not in self._directories or not name:
+                    continue
+                directory, recursive = self._directories[wd]
+                path = os.path.normpath(os.path.join(directory, os.fsdecode(name)))
+                if not mask & IN_ISDIR:
+                    paths.add(path)
+                elif recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land in a new directory before it is watched
+                    try:
+                        paths.update(os.path.normpath(p) for p in self.add(path, True))
+                    except OSError:
+                        lost = True
+
+    def close(self):
+        os.close(self._fd)
+
+
+class FileWatcher:
+    """Report STJ files whose content changed since they were last reported.
+
+    Args:
+        inputs: STJ files, directories or glob patterns, as for ``expand_inputs``
+        debounce: Seconds a file must stay unmodified before it is reported
+        use_inotify: Use inotify where available instead of polling
+    """
+
+    def __init__(self, inputs, debounce=DEFAULT_DEBOUNCE, use_inotify=True):
+        self.inputs = list(inputs)
+        self.debounce = debounce
+        self._known = {}    # path -> (mtime and size, digest) when last reported
+        self._pending = {}  # path -> (mtime and size, monotonic time it settles)
+        self._started = False
+        self._rules = []
+        for item in self.inputs:
+            if os.path.isdir(item):
+                self._rules.append(('dir', os.path.normpath(item)))
+            elif glob.has_magic(item):
+                self._rules.append(('glob', os.path.normpath(item)))
+            else:
+                self._rules.append(('file', os.path.normpath(item)))
+        self._inotify = _Inotify.open(self._roots()) if use_inotify else None
+
+    @property
+    def uses_inotify(self):
+        """Whether changes are detected from inotify events rather than by polling."""
+        return self._inotify is not None
+
+    def _roots(self):
+        """Return the (directory, recursive) pairs to watch for the inputs."""
+        roots = []
+        for kind, value in self._rules:
+            if kind == 'dir':
+                roots.append((value, True))
+            elif kind == 'file':
+                roots.append((os.path.dirname(value) or os.curdir, False))
+            else:
+                parts = value.split(os.sep)
+                fixed = 0
+                while fixed < len(parts) - 1 and not glob.has_magic(parts[fixed]):
+                    fixed += 1
+                base = os.sep.join(parts[:fixed]) if fixed else os.curdir
+                roots.append((base or os.sep, fixed < len(parts) - 1))
+        return roots
+
+    def _matches(self, path):
+        """Whether an event path is one of the inputs."""
+        name = os.path.basename(path)
+        for kind, value in self._rules:
+            if kind == 'dir':
+                if (path.startswith(value.rstrip(os.sep) + os.sep)
+                        and any(fnmatch.fnmatch(name, p) for p in STJ_PATTERNS)):
+                    return True
+            elif kind == 'glob':
+                # fnmatch's '*' crosses directories, so '**/' also has to
+                # match no directory at all, as it does for glob
+                if (fnmatch.fnmatch(path, value)
+                        or fnmatch.fnmatch(path, value.replace('**' + os.sep, ''))):
+                    return True
+            elif path == value:
+                return True
+        return False
+
+    def _scan(self):
+        return [os.path.normpath(p) for p in expand_inputs(self.inputs)]
+
+    def changes(self, timeout=DEFAULT_INTERVAL):
+        """Wait for changed files and return them, sorted.
+
+        The first call returns every input file without waiting.  Later calls
+        wait up to ``timeout`` seconds, less while a change is being
+        debounced, and return the files whose content changed; the list is
+        empty if none did.
+        """
+        if not self._started:
+            self._started = True
+            return self._settle(self._scan())
+        wait = timeout
+        if self._pending:
+            due = min(settles for _signature, settles in self._pending.values())
+            wait = max(0.0, min(timeout, due - time.monotonic()))
+        if self._inotify is None:
+            time.sleep(wait)
+            paths = self._scan()
+        else:
+            events = self._inotify.read(wait)
+            if events is None:
+                paths = self._scan()
+            else:
+                paths = [p for p in events if self._matches(p)]
+        return self._settle(set(paths).union(self._pending))
+
+    def _settle(self, paths):
+        now = time.monotonic()
+        changed = []
+        for path in paths:
+            try:
+                info = os.stat(path)
+            except OSError:
+                self._pending.pop(path, None)
+                continue
+            if not stat.S_ISREG(info.st_mode):
+                continue
+            signature = (info.st_mtime_ns, info.st_size)
+            known = self._known.get(path)
+            if known is not None and known[0] == signature:
+                self._pending.pop(path, None)
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                # Settled files (such as every file at start-up) are due at
+                # once; a future mtime, from another host's clock, waits the
+                # full period
+                age = max(0.0, time.time() - info.st_mtime)
+                pending = (signature, now + max(0.0, self.debounce - age))
+                self._pending[path] = pending
+            if now < pending[1]:
+                continue
+            del self._pending[path]
+            try:
+                digest = file_digest(path)
+            except OSError:
+                continue
+            self._known[path] = (signature, digest)
+            if known is None or known[1] != digest:
+                changed.append(path)
+        return sorted(changed)
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def watch(inputs, task, args=(), report=print, jobs=None, interval=DEFAULT_INTERVAL,
+          debounce=DEFAULT_DEBOUNCE, use_inotify=True, batches=None):
+    """Run ``task(path, *args)`` on every input file, then on each file that changes.
+
+    Each result is passed to ``report`` as it completes.  Batches of changed
+    files are spread over a pool of ``jobs`` worker processes that lasts as
+    long as the watch; a single changed file, or every file with ``jobs`` of
+    1, is processed in this process, without the round trip to a worker.
+
+    Runs until interrupted, or for ``batches`` batches of changed files.
+
+    Returns:
+        int: The number of files processed
+    """
+    watcher = FileWatcher(inputs, debounce, use_inotify)
+    jobs = jobs or os.cpu_count() or 1
+    pool = None
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_ignore_interrupt)
+    processed = 0
+    try:
+        while batches is None or batches > 0:
+            changed = watcher.changes(interval)
+            if not changed:
+                continue
+            if batches is not None:
+                batches -= 1
+            if pool is None or len(changed) == 1:
+                for path in changed:
+                    report(task(path, *args))
+            else:
+                from concurrent.futures import as_completed
+
+                for future in as_completed([pool.submit(task, p, *args) for p in changed]):
+                    report(future.result())
+            processed += len(changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        if pool is not None:
+            pool.shutdown()
+    return processed
+
+
+def add_watch_arguments(parser, jobs=False):
+    """Add watch mode options to an argparse parser."""
+    group = parser.add_argument_group('watch mode')
+    group.add_argument('--watch', action='store_true',
+                       help="Keep running and process files again when they change")
+    group.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                       help=f"Seconds between scans when polling (default: {DEFAULT_INTERVAL})")
+    group.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                       help="Seconds a file must stay unmodified before it is processed "
+                            f"(default: {DEFAULT_DEBOUNCE})")
+    group.add_argument('--poll', action='store_true',
+                       help="Poll even where inotify is available, for example on "
+                            "network filesystems")
+    if jobs:
+        group.add_argument('-j', '--jobs', type=int, default=None,
+                           help="Number of worker processes (default: CPU count)")
+
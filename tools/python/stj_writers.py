@@ -0,0 +1,415 @@
+"""Streaming subtitle writers for STJ conversions.
+
+The writers in this module format timecodes from integer milliseconds and
+write cues straight to an open text file handle, one cue at a time, so a
+conversion never holds more than the cue being written.  Output matches what
+the ``srt``/``webvtt`` based converters produced.  TTML is written the same
+way, as text, without building an XML tree.
+"""
+
+import re
+
+from stjlib.compression import open_text
+from stjlib.core.timing import to_milliseconds
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+_BLANK_LINES = re.compile(r"\n\n+")
+
+# xml.sax.saxutils would pull in urllib.request, which costs more startup
+# time than the rest of a conversion of a short file
+_XML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+_XML_ATTR_ESCAPES = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;',
+    '\n': '&#10;', '\r': '&#13;', '\t': '&#9;',
+})
+
+
+def escape(text):
+    """Escape ``&``, ``<`` and ``>`` for XML character data."""
+    return text.translate(_XML_ESCAPES)
+
+
+def quoteattr(value):
+    """Escape and double-quote a value for use as an XML attribute."""
+    return '"' + value.translate(_XML_ATTR_ESCAPES) + '"'
+
+ASS_SCRIPT_INFO = (
+    '[Script Info]\n'
+    'Title: STJ to ASS Conversion\n'
+    'ScriptType: v4.00+\n'
+    'Collisions: Normal\n'
+    'PlayResX: 1920\n'
+    'PlayResY: 1080\n'
+    'Timer: 100.0000\n'
+    '\n'
+)
+
+ASS_STYLE_FORMAT = (
+    'Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, '
+    'Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, '
+    'Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n'
+)
+
+ASS_DEFAULT_STYLE = (
+    'Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H64000000,'
+    '0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1\n'
+)
+
+ASS_EVENT_FORMAT = 'Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n'
+
+
+def seconds_to_ms(seconds):
+    """Convert an STJ time in seconds to integer milliseconds.
+
+    STJ times carry at most three decimal places, so rounding recovers the
+    exact value the document intended regardless of float representation.
+    Times loaded with ``TimeMode.MILLISECONDS`` are already exact and are
+    used as they are.
+    """
+    return to_milliseconds(seconds)
+
+
+def format_srt_timestamp(ms):
+    """Format milliseconds as ``HH:MM:SS,mmm``."""
+    secs, msecs = divmod(ms, 1000)
+    mins, secs = divmod(secs, 60)
+    hours, mins = divmod(mins, 60)
+    return f"{hours:02d}:{mins:02d}:{secs:02d},{msecs:03d}"
+
+
+def format_vtt_timestamp(ms):
+    """Format milliseconds as ``HH:MM:SS.mmm``."""
+    secs, msecs = divmod(ms, 1000)
+    mins, secs = divmod(secs, 60)
+    hours, mins = divmod(mins, 60)
+    return f"{hours:02d}:{mins:02d}:{secs:02d}.{msecs:03d}"
+
+
+def format_ass_timestamp(ms):
+    """Format milliseconds as ``H:MM:SS.cc`` (centiseconds, truncated)."""
+    secs, msecs = divmod(ms, 1000)
+    mins, secs = divmod(secs, 60)
+    hours, mins = divmod(mins, 60)
+    return f"{hours:01d}:{mins:02d}:{secs:02d}.{msecs // 10:02d}"
+
+
+def cue_text(segment):
+    """Return the cue text for a segment, prefixed with its speaker id."""
+    speaker = getattr(segment, 'speaker_id', None)
+    return f"{speaker}: {segment.text}" if speaker else segment.text
+
+
+def open_output(path, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Open an output file for writing cues with a large write buffer.
+
+    Paths ending in ``.gz``, ``.xz`` or ``.bz2`` are compressed as written.
+    """
+    return open_text(path, 'w', buffering=buffer_size)
+
+
+class SubtitleWriter:
+    """Base class for writers that emit cues to a text file handle.
+
+    Subclasses implement ``write_header`` and ``write_cue``.  Writers are
+    context managers; the header is written on entry and ``close`` only
+    flushes, leaving the handle to its owner.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+
+    def __enter__(self):
+        self.write_header()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def write_header(self):
+        pass
+
+    def write_cue(self, start_ms, end_ms, text, **kwargs):
+        raise NotImplementedError
+
+    def write_segments(self, segments):
+        """Write one cue per timed segment."""
+        for seg in segments:
+            self.write_cue(seconds_to_ms(seg.start), seconds_to_ms(seg.end), cue_text(seg))
+        return self.count
+
+    def write_cues(self, cues, text=None):
+        """Write re-segmented cues (see ``stj_resegment``).
+
+        Args:
+            cues: Iterable of cues with ``start_ms``, ``end_ms``, ``text`` and ``speaker_id``
+            text: Optional callable returning the text for a cue, e.g. karaoke markup
+        """
+        for cue in cues:
+            body = text(cue) if text else cue.text
+            speaker = cue.speaker_id
+            self.write_cue(cue.start_ms, cue.end_ms, f"{speaker}: {body}" if speaker else body)
+        return self.count
+
+    def close(self):
+        self.f.flush()
+
+
+class SRTWriter(SubtitleWriter):
+    """Write SubRip cues.
+
+    Cues with no content, a negative start, or a start at or after their end
+    are skipped and numbering continues without gaps, as ``srt.compose`` does.
+    Blank lines inside cue text are collapsed since SRT uses them as cue
+    separators.
+    """
+
+    def write_cue(self, start_ms, end_ms, text, **kwargs):
+        if not text.strip() or start_ms < 0 or start_ms >= end_ms:
+            return
+        if not text or text[0] == '\n' or '\n\n' in text:
+            text = _BLANK_LINES.sub('\n', text.strip('\n'))
+        self.count += 1
+        self.f.write(
+            f"{self.count}\n"
+            f"{format_srt_timestamp(start_ms)} --> {format_srt_timestamp(end_ms)}\n"
+            f"{text}\n\n"
+        )
+
+
+class VTTWriter(SubtitleWriter):
+    """Write WebVTT cues."""
+
+    def write_header(self):
+        self.f.write('WEBVTT\n')
+
+    def write_cue(self, start_ms, end_ms, text, identifier=None, **kwargs):
+        self.count += 1
+        self.f.write('\n')
+        if identifier:
+            self.f.write(f"{identifier}\n")
+        self.f.write(f"{format_vtt_timestamp(start_ms)} --> {format_vtt_timestamp(end_ms)}\n")
+        for line in text.splitlines():
+            self.f.write(f"{line}\n")
+
+
+class ASSWriter(SubtitleWriter):
+    """Write Advanced SubStation Alpha dialogue events.
+
+    Args:
+        f: Text file handle to write to
+        speakers: Optional speakers used to resolve ``Name`` fields
+    """
+
+    def __init__(self, f, speakers=None):
+        super().__init__(f)
+        self.speaker_names = {}
+        for speaker in speakers or []:
+            self.speaker_names.setdefault(
+                speaker.id, speaker.name if speaker.name is not None else speaker.id
+            )
+
+    def write_header(self):
+        self.f.write(ASS_SCRIPT_INFO)
+        self.f.write('[V4+ Styles]\n')
+        self.f.write(ASS_STYLE_FORMAT)
+        self.f.write(ASS_DEFAULT_STYLE)
+        self.f.write('\n[Events]\n')
+        self.f.write(ASS_EVENT_FORMAT)
+
+    def write_cue(self, start_ms, end_ms, text, name='', style='Default', **kwargs):
+        self.count += 1
+        text = text.replace('\n', '\\N')
+        self.f.write(
+            f"Dialogue: 0,{format_ass_timestamp(start_ms)},{format_ass_timestamp(end_ms)},"
+            f"{style},{name},0000,0000,0000,,{text}\n"
+        )
+
+    def write_segments(self, segments):
+        """Write one dialogue event per segment, naming its speaker."""
+        for seg in segments:
+            speaker_id = seg.speaker_id
+            name = self.speaker_names.get(speaker_id, speaker_id) if speaker_id else ''
+            self.write_cue(seconds_to_ms(seg.start), seconds_to_ms(seg.end), seg.text, name=name)
+        return self.count
+
+    def write_cues(self, cues, text=None):
+        """Write re-segmented cues as dialogue events, naming their speakers."""
+        for cue in cues:
+            speaker_id = cue.speaker_id
+            name = self.speaker_names.get(speaker_id, speaker_id) if speaker_id else ''
+            self.write_cue(cue.start_ms, cue.end_ms, text(cue) if text else cue.text, name=name)
+        return self.count
+
+
+TTML_PROFILE = 'http://www.w3.org/ns/ttml/profile/imsc1/text'
+
+TTML_NAMESPACES = (
+    'xmlns="http://www.w3.org/ns/ttml" '
+    'xmlns:tts="http://www.w3.org/ns/ttml#styling" '
+    'xmlns:ttm="http://www.w3.org/ns/ttml#metadata" '
+    'xmlns:ttp="http://www.w3.org/ns/ttml#parameter"'
+)
+
+TTML_DEFAULT_REGION = ('region-default', '10% 10%', '80% 80%', 'after')
+
+_TTML_VERTICAL = {'top': 'before', 'middle': 'center', 'bottom': 'after'}
+
+
+def _ttml_color(color, opacity=None):
+    """Return a TTML ``#RRGGBBAA`` color, folding a percentage opacity into alpha."""
+    if opacity is None:
+        return color
+    alpha = round(float(opacity.rstrip('%')) * 255 / 100)
+    return f"{color}{alpha:02X}"
+
+
+def ttml_style_attributes(text):
+    """Map ``Style.text`` properties to ``tts:*`` attributes."""
+    attrs = []
+    if 'color' in text:
+        attrs.append(('tts:color', _ttml_color(text['color'], text.get('opacity'))))
+    if 'background' in text:
+        attrs.append(('tts:backgroundColor', text['background']))
+    if text.get('bold'):
+        attrs.append(('tts:fontWeight', 'bold'))
+    if text.get('italic'):
+        attrs.append(('tts:fontStyle', 'italic'))
+    if text.get('underline'):
+        attrs.append(('tts:textDecoration', 'underline'))
+    if 'size' in text:
+        attrs.append(('tts:fontSize', text['size']))
+    return attrs
+
+
+def _ttml_region(display):
+    """Return ``(origin, extent, displayAlign)`` for ``Style.display``, or None."""
+    position = display.get('position')
+    vertical = display.get('vertical')
+    if not position and not vertical:
+        return None
+    _, origin, extent, display_align = TTML_DEFAULT_REGION
+    if position:
+        # Either axis may be missing; it keeps the default region's origin
+        default_x, default_y = origin.split()
+        x = float(position.get('x', default_x).rstrip('%'))
+        y = float(position.get('y', default_y).rstrip('%'))
+        origin = f"{x:g}% {y:g}%"
+        extent = f"{100 - x:g}% {100 - y:g}%"
+    if vertical:
+        display_align = _TTML_VERTICAL.get(vertical, display_align)
+    return origin, extent, display_align
+
+
+def _xml_attrs(attrs):
+    return ''.join(f" {name}={quoteattr(str(value))}" for name, value in attrs)
+
+
+class TTMLWriter(SubtitleWriter):
+    """Write TTML conforming to the IMSC 1 Text Profile.
+
+    The style and region tables are built once from the STJ styles and
+    written in ``<head>``; each cue is then streamed as a ``<p>`` element, so
+    no document tree is ever built.  ``Style.text`` maps to ``tts:`` styling
+    attributes, ``Style.display`` alignment to ``tts:textAlign`` and its
+    position and vertical alignment to regions.  Speakers become
+    ``ttm:agent`` entries referenced from their cues.
+
+    Args:
+        f: Text file handle to write to
+        styles: Optional STJ styles
+        speakers: Optional STJ speakers
+        language: Document language (``xml:lang``); empty when unknown
+    """
+
+    def __init__(self, f, styles=None, speakers=None, language=None):
+        super().__init__(f)
+        self.language = language or ''
+        self.speakers = list(speakers or [])
+        self.styles = {}
+        self.regions = {}
+        self._style_regions = {}
+        self._closed = False
+        for style in styles or []:
+            self._add_style(style)
+
+    def _add_style(self, style):
+        attrs = ttml_style_attributes(style.text) if style.text else []
+        display = style.display or {}
+        if display.get('align'):
+            attrs.append(('tts:textAlign', display['align']))
+        if attrs:
+            self.styles[style.id] = attrs
+        region = _ttml_region(display)
+        if region:
+            region_id = self.regions.get(region)
+            if region_id is None:
+                region_id = f"region-{len(self.regions) + 1}"
+                self.regions[region] = region_id
+            self._style_regions[style.id] = region_id
+
+    def write_header(self):
+        self.f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<tt {TTML_NAMESPACES} ttp:profile="{TTML_PROFILE}" '
+            f'ttp:timeBase="media" xml:lang={quoteattr(self.language)}>\n'
+            '  <head>\n'
+        )
+        if self.speakers:
+            self.f.write('    <metadata>\n')
+            for speaker in self.speakers:
+                agent_id = quoteattr(f"speaker-{speaker.id}")
+                self.f.write(f'      <ttm:agent xml:id={agent_id} type="person">')
+                if speaker.name:
+                    self.f.write(f'<ttm:name type="full">{escape(speaker.name)}</ttm:name>')
+                self.f.write('</ttm:agent>\n')
+            self.f.write('    </metadata>\n')
+        self.f.write('    <styling>\n')
+        for style_id, attrs in self.styles.items():
+            self.f.write(f'      <style{_xml_attrs([("xml:id", f"style-{style_id}")] + attrs)}/>\n')
+        self.f.write('    </styling>\n    <layout>\n')
+        regions = [TTML_DEFAULT_REGION] + [(rid,) + key for key, rid in self.regions.items()]
+        for region_id, origin, extent, display_align in regions:
+            self.f.write(
+                f'      <region xml:id="{region_id}" tts:origin="{origin}" tts:extent="{extent}" '
+                f'tts:displayAlign="{display_align}"/>\n'
+            )
+        self.f.write('    </layout>\n  </head>\n  <body>\n    <div>\n')
+
+    def write_cue(self, start_ms, end_ms, text, style_id=None, speaker_id=None,
+                  language=None, **kwargs):
+        self.count += 1
+        attrs = [('begin', format_vtt_timestamp(start_ms)), ('end', format_vtt_timestamp(end_ms))]
+        if style_id in self.styles:
+            attrs.append(('style', f"style-{style_id}"))
+        attrs.append(('region', self._style_regions.get(style_id, TTML_DEFAULT_REGION[0])))
+        if speaker_id:
+            attrs.append(('ttm:agent', f"speaker-{speaker_id}"))
+        if language and language != self.language:
+            attrs.append(('xml:lang', language))
+        body = '<br/>'.join(escape(line) for line in text.splitlines())
+        self.f.write(f"      <p{_xml_attrs(attrs)}>{body}</p>\n")
+
+    def write_segments(self, segments):
+        """Write one ``<p>`` per timed segment."""
+        for seg in segments:
+            self.write_cue(
+                seconds_to_ms(seg.start), seconds_to_ms(seg.end), seg.text,
+                style_id=seg.style_id, speaker_id=seg.speaker_id, language=seg.language,
+            )
+        return self.count
+
+    def write_cues(self, cues, text=None):
+        """Write re-segmented cues, keeping their style and speaker."""
+        for cue in cues:
+            self.write_cue(cue.start_ms, cue.end_ms, text(cue) if text else cue.text,
+                           style_id=cue.style_id, speaker_id=cue.speaker_id)
+        return self.count
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.f.write('    </div>\n  </body>\n</tt>\n')
+        super().close()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+
+from stj_readers import add_import_arguments, import_vtt, report_import
+
+def vtt_to_stj(vtt_file_path, output_stj_path, language=None, detect_speakers=False):
+    """Convert a WebVTT file to STJ, returning (segment count, issues)."""
+    return import_vtt(vtt_file_path, output_stj_path, language, detect_speakers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert WebVTT to STJ")
+    parser.add_argument('vtt_file', help="Path to the WebVTT file")
+    parser.add_argument('output_stj', help="Path to the output STJ file")
+    add_import_arguments(parser)
+    args = parser.parse_args()
+    count, issues = vtt_to_stj(
+        args.vtt_file, args.output_stj,
+        language=args.language, detect_speakers=args.speakers,
+    )
+    sys.exit(report_import(count, issues, args.output_stj))
+
+if __name__ == "__main__":
+    main()